@@ -10,6 +10,8 @@ Requirements:
     pip install openai
     pip install playsound
     pip install pygame
+Each package is optional and only imported when a mode first needs it
+(python fnaf_ai_game.py --startup-report shows what a launch imports).
 
 Security Note:
     NEVER hardcode API keys in your code. Use environment variables or secure key management.
@@ -19,31 +21,117 @@ Security Note:
 import random
 import time
 import os
+import re
+import sys
+import hashlib
+import importlib
+import math
+import importlib.util
+import queue
+import sqlite3
 import threading
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 
-# Try to import openai - if not available, will use demo mode
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    print("⚠️  OpenAI module not installed. Install it with: pip install openai")
-
-# Try to import pygame for the game window and sound mixing
-try:
-    import pygame
-    PYGAME_AVAILABLE = True
-except ImportError:
-    PYGAME_AVAILABLE = False
-    print("⚠️  pygame not installed. Install it with: pip install pygame")
-
-# Try to import playsound for simple one-shot audio playback
-try:
-    from playsound import playsound
-    PLAYSOUND_AVAILABLE = True
-except ImportError:
-    PLAYSOUND_AVAILABLE = False
-    print("⚠️  playsound not installed. Install it with: pip install playsound")
+from fnaf_night_sim import ANIMATRONICS, CAMERAS, NightSimulation
+
+# ==================== OPTIONAL BACKENDS ====================
+
+class LazyModule:
+    """
+    Optional dependency that is only imported when first used.
+
+    The module-level names openai, pygame and playsound start out as
+    LazyModule stand-ins. The first attribute access or call imports the real
+    object and rebinds the module-level name to it, so demo and text mode
+    never pay for pygame, and nothing pays for openai before the first AI
+    request. installed() answers "could it be imported?" without importing.
+
+    Args:
+        name (str): Module-level name to rebind once loaded.
+        module (str): Module to import (default: name).
+        attribute (str): Object to take from the module instead of the module.
+    """
+
+    def __init__(self, name, module=None, attribute=None):
+        self._name = name
+        self._module = module or name
+        self._attribute = attribute
+        self._target = None
+        self._error = None
+
+    def installed(self):
+        """True if the module can be found, without importing it."""
+        if self._target is not None or self._error is not None:
+            return self._target is not None
+        return importlib.util.find_spec(self._module) is not None
+
+    def available(self):
+        """Import the module if needed; False (after one warning) if it fails."""
+        try:
+            self.load()
+        except ImportError:
+            return False
+        return True
+
+    def load(self):
+        """Import and return the real object, rebinding the module-level name."""
+        if self._target is None:
+            if self._error is not None:
+                raise self._error
+            try:
+                target = importlib.import_module(self._module)
+                if self._attribute:
+                    target = getattr(target, self._attribute)
+            except ImportError as e:
+                self._error = e
+                print(f"⚠️  {self._module} not installed. Install it with: pip install {self._module}")
+                raise
+            self._target = target
+            globals()[self._name] = target
+        return self._target
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+
+# openai - if not available, the game uses demo mode
+openai = LazyModule("openai")
+# pygame for the game window and sound mixing
+pygame = LazyModule("pygame")
+# playsound for simple one-shot audio playback
+playsound = LazyModule("playsound", attribute="playsound")
+
+_BACKENDS = {"openai": openai, "pygame": pygame, "playsound": playsound}
+
+# Old eager-import flags, still importable: fnaf_ai_game.PYGAME_AVAILABLE
+_BACKEND_FLAGS = {"OPENAI_AVAILABLE": "openai", "PYGAME_AVAILABLE": "pygame",
+                  "PLAYSOUND_AVAILABLE": "playsound"}
+
+
+def backend_available(name):
+    """Import optional backend name ("openai", "pygame", "playsound") on first call; True if usable."""
+    return _BACKENDS[name].available()
+
+
+def backend_installed(name):
+    """True if optional backend name is installed, without importing it."""
+    return _BACKENDS[name].installed()
+
+
+def __getattr__(name):
+    if name in _BACKEND_FLAGS:
+        return backend_available(_BACKEND_FLAGS[name])
+    if name == "ai_client":
+        return get_ai_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ==================== CONFIGURATION ====================
 
@@ -53,20 +141,261 @@ except ImportError:
 # On Windows: set OPENAI_API_KEY=your-key-here
 # Or create a .env file and use python-dotenv
 
-# Initialize OpenAI client (for openai >= 1.0.0)
-# For older versions, this will fall back to the legacy API pattern
-openai_client = None
-if OPENAI_AVAILABLE:
+# Animatronics (the roster lives with the night rules in fnaf_night_sim)
+animatronics = list(ANIMATRONICS)
+
+# ==================== AI CLIENT LAYER ====================
+
+# HTTP statuses worth retrying: rate limited or a server-side failure
+_RETRYABLE_STATUSES = {408, 409, 429}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit breaker is open."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Args:
+        rate (float): Tokens added per second (the sustained request rate).
+        capacity (int): Maximum burst size.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        """
+        Take one token, waiting for a refill if necessary.
+
+        Args:
+            deadline (float): time.monotonic() value to give up at.
+
+        Returns:
+            bool: True if a token was taken, False if the deadline passed first.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing backend for a while.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are refused for `reset_seconds`; then a single trial request is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """"closed", "open" or "half-open"."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """Return True if a request may be sent now."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        """Close the circuit after a request that reached the backend."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_skipped(self):
+        """End a request that never reached the backend, counting neither way."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        """Count a failed request, opening the circuit past the threshold."""
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class AIClient:
+    """
+    Resilient wrapper around one shared OpenAI client (openai >= 1.0.0).
+
+    The wrapped client keeps a pool of keep-alive connections. On top of
+    that every request goes through:
+      * a concurrency limit (bounded semaphore),
+      * a token-bucket rate limiter matching the API quota,
+      * a per-request deadline shared by all attempts,
+      * jittered exponential backoff on 429/5xx, timeouts and connection errors,
+      * a circuit breaker that refuses requests while the API keeps failing.
+
+    Args:
+        client: openai.OpenAI instance (built with max_retries=0).
+        requests_per_minute (float): Sustained request quota.
+        burst (int): Requests allowed back-to-back before throttling.
+        max_concurrency (int): Maximum requests in flight.
+        max_retries (int): Retries after the first attempt.
+        base_delay (float): Backoff before the first retry, in seconds.
+        max_delay (float): Upper bound for a single backoff, in seconds.
+        deadline (float): Seconds allowed per request, including retries.
+        breaker (CircuitBreaker): Optional custom circuit breaker.
+    """
+
+    def __init__(self, client, requests_per_minute=60, burst=5, max_concurrency=8,
+                 max_retries=3, base_delay=0.5, max_delay=8.0, deadline=15.0, breaker=None):
+        self.client = client
+        self.limiter = TokenBucket(requests_per_minute / 60.0, burst)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    @staticmethod
+    def _is_retryable(error):
+        """Retry rate limits, server errors, timeouts and dropped connections."""
+        status = getattr(error, "status_code", None)
+        if status is not None:
+            return status in _RETRYABLE_STATUSES or status >= 500
+        # Connection and timeout errors carry no status code
+        return backend_available("openai") and isinstance(error, getattr(openai, "APIConnectionError", ()))
+
+    def _backoff(self, attempt, error):
+        """Full-jitter exponential backoff, honouring a Retry-After header."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    def _give_up_locally(self, attempt):
+        """Settle the breaker for a request abandoned before its next attempt."""
+        if attempt:
+            # Earlier attempts reached the API and failed with retryable errors
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_skipped()
+
+    def create(self, **request):
+        """
+        Create a chat completion (streamed or not) with limits and retries.
+
+        Only attempts that reached the API count towards the circuit
+        breaker: running out of local request slots is congestion on our
+        side, not a sign that the backend is down.
+
+        Raises:
+            CircuitOpenError: The circuit breaker is open.
+            TimeoutError: No request slot was available before the deadline.
+            Exception: The last API error once retries are exhausted.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("AI backend unavailable (circuit open)")
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            if not self.limiter.acquire(deadline):
+                self._give_up_locally(attempt)
+                raise TimeoutError("Local rate limit: no request slot before the deadline")
+            remaining = deadline - time.monotonic()
+            if not self._slots.acquire(timeout=max(0.0, remaining)):
+                self._give_up_locally(attempt)
+                raise TimeoutError("Too many AI requests in flight")
+            try:
+                response = self.client.chat.completions.create(
+                    timeout=max(0.1, deadline - time.monotonic()), **request)
+            except Exception as e:
+                if not self._is_retryable(e):
+                    # The backend answered (e.g. 400/401), so it is not down
+                    self.breaker.record_success()
+                    raise
+                delay = self._backoff(attempt, e)
+                attempt += 1
+                if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                    self.breaker.record_failure()
+                    raise
+                time.sleep(delay)
+                continue
+            finally:
+                self._slots.release()
+            self.breaker.record_success()
+            return response
+
+
+# Shared resilient client, built by the first AI request (see get_ai_client)
+_ai_client = None
+_ai_client_built = False
+_ai_client_lock = threading.Lock()
+
+
+def _build_ai_client():
+    """Create the OpenAI client and its AIClient wrapper (None for legacy openai)."""
+    if not backend_available("openai"):
+        return None
     api_key = os.environ.get("OPENAI_API_KEY", "YOUR_OPENAI_API_KEY")
     try:
-        # Try new client-based API (openai >= 1.0.0)
-        openai_client = openai.OpenAI(api_key=api_key)
+        # Try new client-based API (openai >= 1.0.0); retries are handled by AIClient
+        client = openai.OpenAI(api_key=api_key, max_retries=0)
     except (AttributeError, TypeError):
         # Fall back to legacy API for older versions
         openai.api_key = api_key
+        return None
+    # FNAF_AI_RPM sets the request quota per minute
+    return AIClient(client, requests_per_minute=float(os.environ.get("FNAF_AI_RPM", "60")))
+
 
-# Animatronics
-animatronics = ["Freddy", "Bonnie", "Chica"]
+def get_ai_client():
+    """
+    Return the shared AIClient, building it on first use.
+
+    Returns:
+        AIClient: The client, or None without openai >= 1.0.0.
+    """
+    global _ai_client, _ai_client_built
+    if not _ai_client_built:
+        with _ai_client_lock:
+            if not _ai_client_built:
+                _ai_client = _build_ai_client()
+                _ai_client_built = True
+    return _ai_client
 
 # ==================== SOUND UTILITIES ====================
 
@@ -77,65 +406,839 @@ _mixer_initialized = False
 def _init_mixer():
     """Initialise pygame mixer if not already done."""
     global _mixer_initialized
-    if PYGAME_AVAILABLE and not _mixer_initialized:
+    if not _mixer_initialized and backend_available("pygame"):
         pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=512)
         pygame.mixer.init()
         _mixer_initialized = True
 
 
+class AudioManager:
+    """
+    Play sound files and cues on a fixed pool of voices.
+
+    Files are played with playsound (preferred, as before) on a fixed pool
+    of worker threads fed by a bounded priority queue. Without playsound,
+    and for the synthesized cues of ToneBank, pygame.mixer is used: decoded
+    Sounds are cached by path and played on a fixed number of channels.
+    When every channel is busy, the quietest-priority voice is stolen if
+    the new sound outranks it; otherwise the new sound is dropped.
+
+    on_event is called after the manager's lock is released, so a hook
+    may itself play sounds.
+
+    Args:
+        channels (int): Mixer channels (simultaneous voices) for pygame.
+        workers (int): playsound worker threads.
+        queue_size (int): Pending playsound cues before new ones are dropped.
+        on_event (callable): Instrumentation hook called as
+            on_event(event, name, info) for "dropped", "stolen" and "delayed".
+        delay_threshold_ms (float): Queue wait that counts as "delayed".
+    """
+
+    def __init__(self, channels=8, workers=2, queue_size=16, on_event=None,
+                 delay_threshold_ms=100):
+        self.channels = channels
+        self.workers = workers
+        self.on_event = on_event
+        self.delay_threshold_ms = delay_threshold_ms
+        self.counts = {"played": 0, "dropped": 0, "stolen": 0, "delayed": 0}
+        self._sounds = {}     # path -> decoded pygame Sound
+        self._voices = {}     # channel index -> (priority, started, name)
+        self._queue = queue.PriorityQueue(maxsize=queue_size)
+        self._sequence = 0
+        self._threads = []
+        self._lock = threading.Lock()
+        self._mixer_ready = None
+
+    def _emit(self, event, name, **info):
+        """Count an event and report it to on_event (call without holding self._lock)."""
+        with self._lock:
+            self.counts[event] += 1
+            hook = self.on_event
+        if hook is not None:
+            hook(event, name, info)
+
+    def _use_mixer(self):
+        """Initialise the mixer and channel pool once; False if unavailable."""
+        if self._mixer_ready is None:
+            self._mixer_ready = False
+            if backend_available("pygame"):
+                try:
+                    _init_mixer()
+                    pygame.mixer.set_num_channels(self.channels)
+                    self._mixer_ready = True
+                except pygame.error as e:
+                    print(f"⚠️  pygame mixer unavailable: {e}")
+        return self._mixer_ready
+
+    def preload(self, *filepaths):
+        """
+        Decode audio files for the mixer up front so playing them never touches the disk.
+
+        Returns:
+            bool: False if the mixer is unavailable or a file could not be
+            decoded (reported as a "dropped" event).
+        """
+        if not self._use_mixer():
+            return False
+        decoded = True
+        for filepath in filepaths:
+            if filepath not in self._sounds:
+                try:
+                    self._sounds[filepath] = pygame.mixer.Sound(filepath)
+                except (pygame.error, OSError) as e:
+                    self._emit("dropped", filepath, reason=f"cannot decode: {e}")
+                    decoded = False
+        return decoded
+
+    def _acquire_channel(self, priority, name, events):
+        """Return a free channel, a stolen lower-priority one, or None; events collects "stolen"."""
+        busy = []
+        for index in range(self.channels):
+            channel = pygame.mixer.Channel(index)
+            if not channel.get_busy():
+                break
+            voice_priority, started, _ = self._voices.get(index, (0, 0.0, None))
+            busy.append((voice_priority, started, index))
+        else:
+            # Every voice is busy: steal the lowest-priority, oldest one
+            victim_priority, _, index = min(busy)
+            if victim_priority >= priority:
+                return None
+            channel = pygame.mixer.Channel(index)
+            channel.stop()
+            events.append(("stolen", self._voices[index][2], {"by": name, "priority": victim_priority}))
+        self._voices[index] = (priority, time.monotonic(), name)
+        return channel
+
+    def play_sound(self, sound, priority=0, name=None, block=False):
+        """
+        Play a pygame Sound on the voice pool.
+
+        Args:
+            sound: pygame.mixer.Sound to play.
+            priority (int): Higher priorities may steal voices from lower ones.
+            name (str): Label used in instrumentation events.
+            block (bool): Wait until the sound has finished.
+
+        Returns:
+            bool: False if the sound was dropped.
+        """
+        if not self._use_mixer():
+            self._emit("dropped", name, reason="mixer unavailable", priority=priority)
+            return False
+        events = []
+        with self._lock:
+            channel = self._acquire_channel(priority, name, events)
+            if channel is None:
+                events.append(("dropped", name, {"reason": "no free voice", "priority": priority}))
+            else:
+                channel.play(sound)
+                self.counts["played"] += 1
+        # Hooks run outside the lock, so they may play sounds themselves
+        for event, event_name, info in events:
+            self._emit(event, event_name, **info)
+        if channel is None:
+            return False
+        if block:
+            while channel.get_busy():
+                pygame.time.wait(10)
+        return True
+
+    def play_file(self, filepath, priority=0, block=False):
+        """
+        Play an audio file, decoding it only the first time.
+
+        Args:
+            filepath (str): Path to the audio file.
+            priority (int): Higher priorities win when voices run out.
+            block (bool): Wait until playback finishes.
+
+        Returns:
+            bool: False if the file is missing, cannot be decoded or the cue
+            was dropped.
+        """
+        if not os.path.isfile(filepath):
+            self._emit("dropped", filepath, reason="file not found")
+            return False
+        if backend_available("playsound"):
+            if block:
+                playsound(filepath)
+                self._count_played()
+                return True
+            return self._enqueue(filepath, priority)
+        if not self.preload(filepath):
+            return False
+        return self.play_sound(self._sounds[filepath], priority, filepath, block)
+
+    def _count_played(self):
+        with self._lock:
+            self.counts["played"] += 1
+
+    def _enqueue(self, filepath, priority):
+        """Queue a file for the playsound workers (started on first use)."""
+        with self._lock:
+            while len(self._threads) < self.workers:
+                worker = threading.Thread(target=self._worker, daemon=True,
+                                          name=f"fnaf-audio-{len(self._threads)}")
+                worker.start()
+                self._threads.append(worker)
+            self._sequence += 1
+            item = (-priority, self._sequence, time.monotonic(), filepath)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._emit("dropped", filepath, reason="queue full", priority=priority)
+            return False
+        return True
+
+    def _worker(self):
+        while True:
+            _, _, queued_at, filepath = self._queue.get()
+            if filepath is None:
+                return
+            waited_ms = (time.monotonic() - queued_at) * 1000
+            if waited_ms > self.delay_threshold_ms:
+                self._emit("delayed", filepath, waited_ms=waited_ms)
+            try:
+                playsound(filepath)
+                self._count_played()
+            except Exception as e:
+                self._emit("dropped", filepath, reason=str(e))
+
+    def shutdown(self):
+        """Stop the playsound workers once their queued cues have played."""
+        for _ in self._threads:
+            self._queue.put((float("inf"), 0, 0, None))
+        self._threads = []
+
+
+audio_manager = AudioManager()
+
+
+# Every tone the game plays: cue name -> (frequency Hz, duration ms, volume)
+SOUND_CUES = {
+    "message": (300, 200, 0.5),        # player sent a message
+    "camera_switch": (500, 100, 0.5),  # camera button clicked
+    "movement": (200, 400, 0.5),       # an animatronic moved
+}
+
+# Cue priorities for AudioManager voice stealing (higher wins)
+CUE_PRIORITIES = {"movement": 2, "message": 1, "camera_switch": 0}
+
+
+def _synthesize_tone(frequency, duration_ms, volume, fade_ms):
+    """
+    Build a pygame Sound holding a sine tone with a short fade in and out.
+
+    The linear attack/release envelope avoids the click that a sine wave
+    cut off mid-cycle produces.
+    """
+    import numpy as np  # optional - ToneBank disables itself without it
+    sample_rate, _, channels = pygame.mixer.get_init()
+    n_samples = int(sample_rate * duration_ms / 1000)
+    t = np.arange(n_samples) / sample_rate
+    wave = np.sin(2 * np.pi * frequency * t) * volume
+    fade = min(int(sample_rate * fade_ms / 1000), n_samples // 2)
+    if fade:
+        ramp = np.linspace(0.0, 1.0, fade, endpoint=False)
+        wave[:fade] *= ramp
+        wave[n_samples - fade:] *= ramp[::-1]
+    samples = (wave * 32767).astype(np.int16)
+    # pygame expects one column per mixer channel, C-contiguous
+    frames = np.ascontiguousarray(np.repeat(samples[:, None], channels, axis=1))
+    return pygame.sndarray.make_sound(frames if channels > 1 else samples)
+
+
+class ToneBank:
+    """
+    Pre-built pygame Sound objects for the game's beep cues.
+
+    All cues are synthesized once by load() (or loaded from audio files with
+    add_file), so playing a cue is a dictionary lookup plus Sound.play().
+    Tones not registered as cues are kept in a small LRU.
+
+    Args:
+        cues (dict): Cue name -> (frequency Hz, duration ms, volume).
+        max_adhoc (int): Ad-hoc tones kept in the LRU.
+        fade_ms (int): Length of the fade in/out envelope.
+    """
+
+    def __init__(self, cues=None, max_adhoc=32, fade_ms=5):
+        self.cues = dict(SOUND_CUES if cues is None else cues)
+        self.max_adhoc = max_adhoc
+        self.fade_ms = fade_ms
+        self.enabled = True   # until load() finds pygame or numpy missing
+        self._sounds = {}
+        self._adhoc = OrderedDict()
+        self._loaded = False
+
+    def _disable(self, reason):
+        self.enabled = False
+        print(f"⚠️  Sound disabled: {reason}")
+
+    def load(self):
+        """Initialise the mixer and synthesize every cue (call once at startup)."""
+        if self._loaded or not self.enabled:
+            return
+        self._loaded = True
+        if not backend_available("pygame"):
+            self.enabled = False
+            return
+        try:
+            _init_mixer()
+            for name, (frequency, duration_ms, volume) in self.cues.items():
+                self._sounds[name] = _synthesize_tone(frequency, duration_ms, volume, self.fade_ms)
+        except ImportError:
+            self._disable("numpy is not installed (pip install numpy)")
+        except pygame.error as e:
+            self._disable(f"audio device unavailable ({e})")
+
+    def add_file(self, name, filepath):
+        """Register a cue backed by an audio file, decoded once."""
+        self.load()
+        if self.enabled:
+            self._sounds[name] = pygame.mixer.Sound(filepath)
+
+    def play(self, name, priority=0):
+        """Play a registered cue on the shared AudioManager voice pool."""
+        self.load()
+        sound = self._sounds.get(name)
+        if sound is not None:
+            audio_manager.play_sound(sound, priority, name)
+
+    def play_tone(self, frequency, duration_ms, volume=0.5):
+        """Play an arbitrary tone, reusing a cached Sound when possible."""
+        self.load()
+        if not self.enabled:
+            return
+        key = (frequency, duration_ms, volume)
+        sound = self._adhoc.get(key)
+        if sound is None:
+            sound = self._adhoc[key] = _synthesize_tone(frequency, duration_ms, volume, self.fade_ms)
+            if len(self._adhoc) > self.max_adhoc:
+                self._adhoc.popitem(last=False)
+        else:
+            self._adhoc.move_to_end(key)
+        audio_manager.play_sound(sound, name=f"tone {frequency} Hz")
+
+
+tone_bank = ToneBank()
+
+
+def play_cue(name):
+    """
+    Play one of the game's sound cues (see SOUND_CUES).
+
+    Args:
+        name (str): Cue name, e.g. "camera_switch".
+    """
+    tone_bank.play(name, CUE_PRIORITIES.get(name, 0))
+
+
 def play_sound_pygame(frequency=440, duration_ms=300, volume=0.5):
     """
-    Generate and play a simple beep tone via pygame.mixer.
+    Play a simple beep tone via pygame.mixer.
+
+    Tones are synthesized once and cached by the shared ToneBank; prefer
+    play_cue() for the game's own sounds.
 
     Args:
         frequency (int): Tone frequency in Hz (default 440 Hz = A4).
         duration_ms (int): Duration in milliseconds.
         volume (float): Playback volume between 0.0 and 1.0.
     """
-    if not PYGAME_AVAILABLE:
-        return
-    try:
-        import numpy as np  # optional - gracefully skip if unavailable
-        _init_mixer()
-        sample_rate = 44100
-        n_samples = int(sample_rate * duration_ms / 1000)
-        t = np.linspace(0, duration_ms / 1000, n_samples, endpoint=False)
-        wave = (np.sin(2 * np.pi * frequency * t) * 32767 * volume).astype(np.int16)
-        # pygame requires stereo array (shape: n_samples × 2)
-        stereo = np.column_stack([wave, wave])
-        sound = pygame.sndarray.make_sound(stereo)
-        sound.play()
-    except Exception:
-        # numpy unavailable or other error – silently skip
-        pass
+    tone_bank.play_tone(frequency, duration_ms, volume)
 
 
-def play_sound_file(filepath, block=False):
+def play_sound_file(filepath, block=False, priority=0):
     """
-    Play an audio file using playsound (preferred) or pygame.mixer as fallback.
+    Play an audio file through the shared AudioManager.
+
+    Uses playsound (preferred) on a fixed worker pool, otherwise
+    pygame.mixer, where each file is decoded once and played on a fixed
+    voice pool. Files that cannot be decoded are skipped.
 
     Args:
         filepath (str): Absolute or relative path to the audio file.
         block (bool): If True, block until playback finishes.
+        priority (int): Higher priorities win when all voices are busy.
+
+    Returns:
+        bool: False if the file is missing or the cue was dropped.
     """
-    if not os.path.isfile(filepath):
-        return  # File not found – skip silently
+    return audio_manager.play_file(filepath, priority, block)
 
-    if PLAYSOUND_AVAILABLE:
-        if block:
-            playsound(filepath)
+
+# ==================== RESPONSE CACHE ====================
+
+def _normalize_prompt(player_input):
+    """Lowercase a prompt and strip punctuation and extra spacing, for cache keys."""
+    return " ".join(re.sub(r"[^\w\s]", "", player_input.lower()).split())
+
+
+class ResponseCache:
+    """
+    Two-tier cache for AI replies: an in-memory LRU plus an optional SQLite file.
+
+    Players type the same few phrases ("hello", "who are you?") over and
+    over. Replies are keyed on a hash of the animatronic, the normalized
+    prompt and an optional context (a digest of the conversation so far, see
+    ConversationMemory.context_key), and each key keeps several reply
+    variants so a cached answer is not repeated verbatim: until a key has
+    `variants` replies, lookups miss and a fresh reply is fetched and added.
+
+    Args:
+        max_entries (int): Keys kept in the in-memory LRU.
+        ttl_seconds (float): Replies older than this are treated as missing.
+        variants (int): Replies collected per key before serving from cache.
+        db_path (str): Optional SQLite file for the on-disk tier.
+    """
+
+    def __init__(self, max_entries=512, ttl_seconds=24 * 3600, variants=3, db_path=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.variants = variants
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()   # key -> list of (created, reply)
+        self._last_served = {}         # key -> reply served last time
+        self._lock = threading.Lock()  # AIWorker threads share the cache
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT NOT NULL, reply TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_key ON responses (key)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(animatronic, player_input, context=""):
+        """Hash the animatronic, the normalized prompt and the conversation context."""
+        key = f"{animatronic}\0{_normalize_prompt(player_input)}"
+        if context:
+            key += f"\0{context}"   # no context: the same keys as before contexts existed
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _fresh(self, entries):
+        cutoff = time.time() - self.ttl_seconds
+        return [entry for entry in entries if entry[0] >= cutoff]
+
+    def _load(self, key):
+        """Return fresh variants for key from memory, falling back to disk."""
+        entries = self._memory.get(key)
+        if entries is None and self._db is not None:
+            rows = self._db.execute(
+                "SELECT created, reply FROM responses WHERE key = ? AND created >= ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchall()
+            if rows:
+                entries = rows
+                self.disk_hits += 1
+        if entries is None:
+            return []
+        entries = self._fresh(entries)
+        self._remember(key, entries)
+        return entries
+
+    def _remember(self, key, entries):
+        self._memory[key] = entries
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            evicted, _ = self._memory.popitem(last=False)
+            self._last_served.pop(evicted, None)
+
+    def get(self, animatronic, player_input, context=""):
+        """
+        Return a cached reply, or None if a new reply should be fetched.
+
+        Args:
+            animatronic (str): Who is answering.
+            player_input (str): The player's message.
+            context (str): Digest of the conversation so far ("" for none).
+
+        Returns:
+            str or None: One of the cached variants (avoiding the one served
+            last time) once `variants` replies are cached for this prompt.
+        """
+        key = self.make_key(animatronic, player_input, context)
+        with self._lock:
+            entries = self._load(key)
+            if len(entries) < self.variants:
+                self.misses += 1
+                return None
+            self.hits += 1
+            choices = [reply for _, reply in entries if reply != self._last_served.get(key)]
+            reply = random.choice(choices or [reply for _, reply in entries])
+            self._last_served[key] = reply
+            return reply
+
+    def put(self, animatronic, player_input, reply, context=""):
+        """Store a freshly generated reply as another variant for this prompt and context."""
+        key = self.make_key(animatronic, player_input, context)
+        created = time.time()
+        with self._lock:
+            entries = self._load(key)
+            if any(existing == reply for _, existing in entries):
+                return
+            self._remember(key, (entries + [(created, reply)])[-self.variants:])
+            if self._db is not None:
+                self._db.execute("INSERT INTO responses VALUES (?, ?, ?)", (key, reply, created))
+                self._db.commit()
+
+    def stats(self):
+        """
+        Return hit/miss metrics.
+
+        Returns:
+            dict: hits, disk_hits (memory misses served from disk), misses,
+            hit_rate and the number of keys held in memory.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "keys_in_memory": len(self._memory),
+        }
+
+
+# Shared cache in front of ai_response. Set FNAF_CACHE_DB to a file path
+# to keep replies across runs.
+response_cache = ResponseCache(db_path=os.environ.get("FNAF_CACHE_DB"))
+
+
+# ==================== MESSAGE LOG ====================
+
+# Message lines kept in memory for the on-screen log
+MESSAGE_LOG_CAPACITY = 100
+
+TranscriptLine = namedtuple("TranscriptLine", ["seq", "time", "text"])
+TranscriptLine.__doc__ = """
+One line of a night's transcript
+
+    seq: Position of the line in the night's message log
+    time: Unix time the line was completed
+    text: The line as shown on screen
+"""
+
+
+class MessageLog:
+    """
+    Fixed-capacity message history for the on-screen log.
+
+    Only the last `capacity` lines stay in memory; the full history goes to
+    an optional TranscriptWriter. Lines are addressed by a sequence number,
+    so a streamed reply can keep updating its line after newer lines were
+    added, even once it has scrolled out of memory. A line is written to
+    the transcript when it is final.
+
+    Args:
+        capacity (int): Lines kept in memory.
+        transcript (TranscriptWriter): Optional writer for completed lines.
+    """
+
+    def __init__(self, capacity=MESSAGE_LOG_CAPACITY, transcript=None):
+        self.transcript = transcript
+        self._lines = deque(maxlen=capacity)
+        self._next_seq = 0
+        self._open = {}   # seq -> text of lines that are not final yet
+
+    def __len__(self):
+        return len(self._lines)
+
+    def __iter__(self):
+        return iter(self._lines)
+
+    def append(self, text, final=True):
+        """Add a line; returns its sequence number for later update()s."""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._lines.append(text)
+        if final:
+            self._finish(seq, text)
         else:
-            threading.Thread(target=playsound, args=(filepath,), daemon=True).start()
-    elif PYGAME_AVAILABLE:
+            self._open[seq] = text
+        return seq
+
+    def update(self, seq, text, final=False):
+        """Replace the text of a line that is not final yet."""
+        if seq not in self._open:
+            return
+        index = seq - (self._next_seq - len(self._lines))
+        if index >= 0:
+            self._lines[index] = text
+        if final:
+            del self._open[seq]
+            self._finish(seq, text)
+        else:
+            self._open[seq] = text
+
+    def tail(self, count):
+        """The last count lines, oldest first, as a tuple."""
+        start = max(0, len(self._lines) - count)
+        return tuple(self._lines[i] for i in range(start, len(self._lines)))
+
+    def close(self):
+        """Write unfinished lines as they stand and close the transcript."""
+        for seq, text in sorted(self._open.items()):
+            self._finish(seq, text)
+        self._open.clear()
+        if self.transcript is not None:
+            try:
+                self.transcript.close()
+            except Exception as e:
+                self._drop_transcript(e)
+
+    def _finish(self, seq, text):
+        if self.transcript is not None:
+            try:
+                self.transcript.write(seq, text)
+            except Exception as e:
+                self._drop_transcript(e)
+
+    def _drop_transcript(self, error):
+        # A failing disk should not end the night; the in-memory log carries on
+        print(f"⚠️  Transcript disabled: {error}")
+        self.transcript = None
+
+
+class TranscriptWriter:
+    """
+    Append transcript lines to a gzip-compressed JSON-lines file on a background thread.
+
+    write() only puts the line on a queue, so the frame loop never waits on
+    compression or the disk. The writer thread collects lines for up to
+    flush_interval seconds (or batch_size lines), then writes and flushes
+    them as one batch. If the thread fails (disk full, unwritable path),
+    the error is kept in `error` and re-raised by every later write() and
+    by close(), so lines stop piling up in the queue.
+
+    Args:
+        path (str): Transcript file (*.jsonl.gz); appended to if it exists.
+        batch_size (int): Most lines written per batch.
+        flush_interval (float): Longest time a line waits before it is written.
+    """
+
+    def __init__(self, path, batch_size=256, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.error = None
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="fnaf-transcript")
+        self._thread.start()
+
+    def write(self, seq, text):
+        """Queue one completed line; raises the writer thread's error if it failed."""
+        if self.error is not None:
+            raise self.error
+        self._queue.put(TranscriptLine(seq, time.time(), text))
+
+    def close(self, timeout=5.0):
+        """Write the queued lines and stop the writer thread; raises its error if it failed."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
         try:
-            _init_mixer()
-            sound = pygame.mixer.Sound(filepath)
-            sound.play()
-            if block:
-                while pygame.mixer.get_busy():
-                    pygame.time.wait(50)
-        except Exception:
-            pass
+            self._write_batches()
+        except Exception as e:
+            self.error = e
+
+    def _write_batches(self):
+        import gzip
+        import json
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            closing = False
+            while not closing:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while batch[-1] is not None and len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+                if batch[-1] is None:
+                    closing = True
+                    batch.pop()
+                if batch:
+                    f.write("".join(json.dumps(line._asdict(), ensure_ascii=False) + "\n"
+                                    for line in batch))
+                    f.flush()
+                    self.written += len(batch)
+
+
+class TranscriptArchive:
+    """
+    Replay the transcripts of past nights.
+
+    Each run of run_pygame_game with FNAF_TRANSCRIPT_DIR set writes one
+    night-<date>-<time>.jsonl.gz file there. Lines are stored in the order
+    they were completed; page() streams through the compressed file and
+    stops at the requested page, so early pages of a long night open
+    without decompressing the rest.
+
+    Args:
+        directory (str): Transcript directory.
+
+    Example:
+        >>> archive = TranscriptArchive("transcripts")        # doctest: +SKIP
+        >>> night = archive.nights()[-1]                       # doctest: +SKIP
+        >>> [line.text for line in archive.page(night, 0, 5)]  # doctest: +SKIP
+    """
+
+    SUFFIX = ".jsonl.gz"
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    @classmethod
+    def new_night_path(cls, directory):
+        """File name for a night starting now."""
+        return os.path.join(directory, time.strftime("night-%Y%m%d-%H%M%S") + cls.SUFFIX)
+
+    def nights(self):
+        """Names of the recorded nights, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len(self.SUFFIX)] for name in os.listdir(self.directory)
+                      if name.endswith(self.SUFFIX))
+
+    def lines(self, night):
+        """
+        Iterate a night's TranscriptLines in the order they were written.
+
+        A file whose gzip stream never ended (the night is still being
+        written, or the game crashed) yields the lines decoded so far.
+        """
+        import gzip
+        import json
+        import zlib
+
+        with gzip.open(os.path.join(self.directory, night + self.SUFFIX), "rt", encoding="utf-8") as f:
+            try:
+                for raw in f:
+                    try:
+                        line = TranscriptLine(**json.loads(raw))
+                    except (ValueError, TypeError):
+                        return  # cut short by a crash mid-batch
+                    yield line
+            except (EOFError, zlib.error, gzip.BadGzipFile, UnicodeDecodeError):
+                return  # compressed stream ends without its end-of-stream marker
+
+    def page(self, night, number, size=50):
+        """Page `number` (from 0) of a night, `size` lines per page."""
+        return list(islice(self.lines(night), number * size, (number + 1) * size))
+
+    def load(self, night):
+        """Every line of a night, in on-screen order."""
+        return sorted(self.lines(night), key=lambda line: line.seq)
+
+
+# ==================== AI WORKER ====================
+
+# Placeholder shown in the message log while an AI reply is on its way
+_TYPING_PLACEHOLDER = "typing…"
+
+
+class StreamingReply:
+    """
+    An AI reply that grows as tokens arrive on a background thread.
+
+    Attributes:
+        text (str): Text received so far.
+        future (Future): Resolves to the complete, stripped reply.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.future = None
+
+    def done(self):
+        """True once the reply is complete (or failed)."""
+        return self.future.done()
+
+    def result(self):
+        """Return the complete reply; raises if the responder failed."""
+        return self.future.result()
+
+
+class AIWorker:
+    """
+    Run AI requests on background threads so the game loop never blocks.
+
+    submit() returns a StreamingReply immediately; the frame loop reads its
+    text as tokens arrive and polls done() while it keeps drawing.
+
+    Args:
+        responder (callable): Function (animatronic, player_input) returning
+            the reply as a str or as an iterable of text pieces. Defaults to
+            ai_response_stream; tests can pass a stub with artificial delay.
+        max_workers (int): Maximum number of concurrent requests.
+    """
+
+    def __init__(self, responder=None, max_workers=2):
+        self.responder = responder or ai_response_stream
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="fnaf-ai")
+        self._closed = False
+
+    def submit(self, animatronic, player_input):
+        """Queue a request and return its StreamingReply."""
+        reply = StreamingReply()
+        reply.future = self._executor.submit(self._run, reply, animatronic, player_input)
+        return reply
+
+    def _run(self, reply, animatronic, player_input):
+        result = self.responder(animatronic, player_input)
+        pieces = [result] if isinstance(result, str) else result
+        for piece in pieces:
+            if self._closed:
+                break  # player quit - stop reading the stream
+            reply.text += piece
+        return reply.text.strip()
+
+    def shutdown(self):
+        """Cancel queued requests and stop in-flight streams without waiting."""
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _collect_replies(pending_replies, messages):
+    """
+    Show streamed text and finish replies that have completed.
+
+    Args:
+        pending_replies (list): (StreamingReply, message seq, animatronic)
+            tuples; finished entries are removed in place.
+        messages (MessageLog): Message log holding each reply's line.
+    """
+    for pending in list(pending_replies):
+        reply, seq, animatronic = pending
+        if not reply.done():
+            messages.update(seq, f"{animatronic}: {reply.text.lstrip() or _TYPING_PLACEHOLDER}")
+            continue
+        pending_replies.remove(pending)
+        try:
+            text = reply.result()
+        except Exception as e:
+            text = f"[ERROR: {e}]"
+        messages.update(seq, f"{animatronic}: {text}", final=True)
 
 
 # ==================== PYGAME GAME WINDOW ====================
@@ -150,6 +1253,131 @@ _GREY   = (40,  40,  40)
 _DARK   = (15,  15,  15)
 
 
+# Most text surfaces kept by the HUD render cache
+TEXT_CACHE_SIZE = 256
+
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces keyed by (font, text, colour).
+
+    font.render is the most expensive call in the HUD, and the strings it
+    draws (camera names, power label, message lines) rarely change between
+    frames.
+
+    Args:
+        max_entries (int): Surfaces to keep before evicting the least recent.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, colour):
+        """Return the antialiased surface for text, rendering it on first use."""
+        key = (font, text, colour)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, colour)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop every cached surface (e.g. after the display is recreated)."""
+        self._surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+class RetainedLayer:
+    """
+    Retained-mode HUD: widgets are redrawn only when their inputs change.
+
+    Each widget owns a fixed screen rect and a draw function. render() compares
+    every widget's inputs with the previous frame; for each widget that changed,
+    its rect is cleared and every widget overlapping it is redrawn clipped to
+    that rect, in the order the widgets were added, so overlapping widgets
+    composite exactly as a full redraw would.
+
+    Args:
+        background (tuple): Colour used to clear dirty areas.
+        profiler (FrameProfiler): Optional; each widget draw is charged to
+            its "draw.<name>" phase.
+    """
+
+    def __init__(self, background=_DARK, profiler=None):
+        self.background = background
+        self.profiler = profiler
+        self._widgets = []   # [name, rect, draw, last inputs]
+        self._full_redraw = True
+
+    def add(self, name, rect, draw):
+        """Register a widget; draw(surface, *inputs) must stay inside rect."""
+        self._widgets.append([name, pygame.Rect(rect), draw, None])
+        self._full_redraw = True
+
+    def invalidate(self):
+        """Force the next render() to redraw the whole surface."""
+        self._full_redraw = True
+
+    def render(self, surface, inputs):
+        """
+        Redraw the widgets whose inputs changed.
+
+        Args:
+            surface (pygame.Surface): Target surface, normally the display.
+            inputs (dict): Widget name -> tuple of draw arguments.
+
+        Returns:
+            list: Dirty pygame.Rects for pygame.display.update (empty when
+            nothing changed).
+        """
+        if self._full_redraw:
+            self._full_redraw = False
+            surface.fill(self.background)
+            for widget in self._widgets:
+                widget[3] = inputs[widget[0]]
+                self._draw(surface, widget[0], widget[2], widget[3])
+            return [surface.get_rect()]
+
+        dirty = [widget[1] for widget in self._widgets if inputs[widget[0]] != widget[3]]
+        if not dirty:
+            return []
+        for widget in self._widgets:
+            widget[3] = inputs[widget[0]]
+        for rect in dirty:
+            surface.set_clip(rect)
+            surface.fill(self.background)
+            for name, widget_rect, draw, args in self._widgets:
+                if widget_rect.colliderect(rect):
+                    self._draw(surface, name, draw, args)
+        surface.set_clip(None)
+        return dirty
+
+    def _draw(self, surface, name, draw, args):
+        if self.profiler is None:
+            draw(surface, *args)
+            return
+        started = time.perf_counter()
+        draw(surface, *args)
+        self.profiler.add(f"draw.{name}", time.perf_counter() - started)
+
+
+def _draw_title(surface, night, power, big_font):
+    """Render the title bar along the top edge."""
+    title = text_cache.render(big_font, f"FNAF AI Night  |  Night {night}  |  🔋 Power: {power}%", _WHITE)
+    surface.blit(title, (20, 8))
+
+
 def _draw_power_bar(surface, power, font):
     """Render the power bar in the bottom-left corner."""
     bar_x, bar_y = 20, surface.get_height() - 40
@@ -160,7 +1388,7 @@ def _draw_power_bar(surface, power, font):
     fill_colour = _GREEN if power > 50 else (_YELLOW if power > 25 else _RED)
     pygame.draw.rect(surface, fill_colour, (bar_x, bar_y, int(bar_w * power / 100), bar_h))
     pygame.draw.rect(surface, _WHITE, (bar_x, bar_y, bar_w, bar_h), 2)
-    label = font.render(f"Power: {power}%", True, _WHITE)
+    label = text_cache.render(font, f"Power: {power}%", _WHITE)
     surface.blit(label, (bar_x, bar_y - 22))
 
 
@@ -170,17 +1398,17 @@ def _draw_camera_view(surface, camera, animatronic_locations, font):
     pygame.draw.rect(surface, _GREY, cam_rect)
     pygame.draw.rect(surface, _GREEN, cam_rect, 2)
 
-    cam_label = font.render(f"CAM {camera}", True, _GREEN)
+    cam_label = text_cache.render(font, f"CAM {camera}", _GREEN)
     surface.blit(cam_label, (cam_rect.x + 10, cam_rect.y + 10))
 
     # Show animatronics present in this camera
     present = [name for name, loc in animatronic_locations.items() if loc == camera]
     if present:
         for i, name in enumerate(present):
-            txt = font.render(f"👁  {name}", True, _RED)
+            txt = text_cache.render(font, f"👁  {name}", _RED)
             surface.blit(txt, (cam_rect.x + 10, cam_rect.y + 40 + i * 28))
     else:
-        empty = font.render("[ empty ]", True, _GREY)
+        empty = text_cache.render(font, "[ empty ]", _GREY)
         surface.blit(empty, (cam_rect.x + 10, cam_rect.y + 40))
 
 
@@ -188,44 +1416,308 @@ def _draw_message_log(surface, messages, font):
     """Display the last few AI messages in the bottom panel."""
     x, y = 50, surface.get_height() - 100
     for line in messages[-3:]:
-        rendered = font.render(line[:80], True, _WHITE)
+        rendered = text_cache.render(font, line[:80], _WHITE)
         surface.blit(rendered, (x, y))
         y += 22
 
 
-def _draw_camera_buttons(surface, cameras, current_cam, small_font):
-    """Draw camera selection buttons along the top."""
+def _camera_button_rects(cameras):
+    """Screen rects of the camera selection buttons, keyed by camera name."""
     btn_w, btn_h = 90, 30
     start_x = 50
     y = 40
-    rects = {}
-    for i, cam in enumerate(cameras):
-        rect = pygame.Rect(start_x + i * (btn_w + 10), y, btn_w, btn_h)
+    return {cam: pygame.Rect(start_x + i * (btn_w + 10), y, btn_w, btn_h)
+            for i, cam in enumerate(cameras)}
+
+
+def _draw_camera_buttons(surface, cameras, current_cam, small_font):
+    """Draw camera selection buttons along the top."""
+    rects = _camera_button_rects(cameras)
+    for cam, rect in rects.items():
         colour = _GREEN if cam == current_cam else _GREY
         pygame.draw.rect(surface, colour, rect)
         pygame.draw.rect(surface, _WHITE, rect, 1)
-        label = small_font.render(cam, True, _BLACK if cam == current_cam else _WHITE)
+        label = text_cache.render(small_font, cam, _BLACK if cam == current_cam else _WHITE)
         surface.blit(label, (rect.x + 5, rect.y + 7))
-        rects[cam] = rect
     return rects
 
 
-def run_pygame_game():
+def _draw_input_box(surface, text_input, small_font):
+    """Draw the text input box along the bottom edge."""
+    input_rect = pygame.Rect(50, surface.get_height() - 40, surface.get_width() - 100, 30)
+    pygame.draw.rect(surface, _GREY, input_rect)
+    pygame.draw.rect(surface, _WHITE, input_rect, 1)
+    input_text = text_cache.render(small_font, f"> {text_input}_", _GREEN)
+    surface.blit(input_text, (input_rect.x + 5, input_rect.y + 7))
+
+
+def _draw_profiler_overlay(surface, lines, small_font):
+    """Draw the frame profiler's statistics panel (nothing when lines is empty)."""
+    if not lines:
+        return
+    rect = _profiler_overlay_rect(surface.get_width())
+    panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 190))
+    surface.blit(panel, rect.topleft)
+    pygame.draw.rect(surface, _YELLOW, rect, 1)
+    for i, line in enumerate(lines[:PROFILER_OVERLAY_LINES]):
+        surface.blit(text_cache.render(small_font, line, _YELLOW), (rect.x + 8, rect.y + 6 + i * 18))
+
+
+def _profiler_overlay_rect(width):
+    return pygame.Rect(width - 390, 86, 380, PROFILER_OVERLAY_LINES * 18 + 12)
+
+
+def _build_hud(width, height, cameras, font, small_font, big_font, profiler=None):
+    """Lay out the HUD widgets of run_pygame_game in their drawing order."""
+    button_rects = list(_camera_button_rects(cameras).values())
+    layer = RetainedLayer(_DARK, profiler)
+    layer.add("title", (0, 0, width, 44),
+              lambda surface, night, power: _draw_title(surface, night, power, big_font))
+    layer.add("buttons", button_rects[0].unionall(button_rects[1:]),
+              lambda surface, current_cam: _draw_camera_buttons(surface, cameras, current_cam, small_font))
+    layer.add("camera", (50, 80, width - 100, height - 180),
+              lambda surface, camera, locations: _draw_camera_view(surface, camera, dict(locations), font))
+    layer.add("power", (20, height - 64, 204, 46),
+              lambda surface, power: _draw_power_bar(surface, power, font))
+    layer.add("log", (50, height - 100, width - 50, 66),
+              lambda surface, lines: _draw_message_log(surface, lines, small_font))
+    layer.add("input", (50, height - 40, width - 100, 30),
+              lambda surface, text_input: _draw_input_box(surface, text_input, small_font))
+    layer.add("profiler", _profiler_overlay_rect(width),
+              lambda surface, lines: _draw_profiler_overlay(surface, lines, small_font))
+    return layer
+
+
+# ==================== FRAME PROFILER ====================
+
+# Frames kept for the rolling percentiles (20 s at 30 FPS)
+PROFILE_WINDOW = 600
+
+# Text lines in the on-screen profiler overlay (toggled with F3)
+PROFILER_OVERLAY_LINES = 11
+
+
+class FrameProfiler:
+    """
+    Per-phase frame timings with rolling percentiles and optional traces.
+
+    begin_frame() starts a frame (and closes the previous one); each lap()
+    charges the time since the previous lap to the named phase, so a loop
+    body reads as a sequence of laps. Code timed on its own, like each HUD
+    widget's draw, reports with add(). A frame counts as dropped when its
+    work (everything but the "idle" phase) takes longer than drop_factor
+    times the target interval; long idle waits between timer ticks are not
+    drops.
+
+    Args:
+        target_fps (float): Frame rate the loop aims for.
+        window (int): Frames kept for the rolling percentiles.
+        drop_factor (float): Target-interval multiple at which a frame is dropped.
+        trace (bool): Keep each frame's timings for write_trace().
+        trace_limit (int): Most recent frames kept in the trace.
+
+    Example:
+        >>> profiler = FrameProfiler(trace=True)
+        >>> profiler.begin_frame()
+        >>> profiler.lap("events")
+        >>> profiler.end_frame()
+        >>> profiler.frames, sorted(profiler.stats()["phases"])
+        (1, ['events', 'frame', 'work'])
+    """
+
+    def __init__(self, target_fps=30, window=PROFILE_WINDOW, drop_factor=1.0,
+                 trace=False, trace_limit=100_000):
+        self.target_ms = 1000.0 / target_fps
+        self.drop_factor = drop_factor
+        self.window = window
+        self.frames = 0
+        self.dropped = 0
+        self._history = {}   # phase -> deque of the last `window` samples (ms)
+        self._trace = deque(maxlen=trace_limit) if trace else None
+        self._phases = {}
+        self._started = None
+        self._lap = None
+        self._epoch = time.perf_counter()
+
+    @property
+    def tracing(self):
+        """True if frames are being kept for write_trace()."""
+        return self._trace is not None
+
+    def begin_frame(self):
+        """Start a frame, closing the previous one if still open."""
+        now = time.perf_counter()
+        if self._started is not None:
+            self._close(now)
+        self._started = self._lap = now
+        self._phases = {}
+
+    def lap(self, phase):
+        """Charge the time since the previous lap (or frame start) to phase."""
+        now = time.perf_counter()
+        self._phases[phase] = self._phases.get(phase, 0.0) + (now - self._lap) * 1000
+        self._lap = now
+
+    def add(self, phase, seconds):
+        """Charge separately measured time to phase, leaving the lap clock alone."""
+        self._phases[phase] = self._phases.get(phase, 0.0) + seconds * 1000
+
+    def end_frame(self):
+        """Close the current frame (begin_frame does this implicitly)."""
+        if self._started is not None:
+            self._close(time.perf_counter())
+            self._started = None
+
+    def _close(self, now):
+        phases = self._phases
+        phases["frame"] = frame_ms = (now - self._started) * 1000
+        phases["work"] = frame_ms - phases.get("idle", 0.0)
+        self.frames += 1
+        if phases["work"] > self.target_ms * self.drop_factor:
+            self.dropped += 1
+        for phase, ms in phases.items():
+            samples = self._history.get(phase)
+            if samples is None:
+                samples = self._history[phase] = deque(maxlen=self.window)
+            samples.append(ms)
+        if self._trace is not None:
+            self._trace.append((self.frames, self._started - self._epoch, phases))
+
+    def stats(self):
+        """
+        Rolling statistics over the last `window` frames.
+
+        Returns:
+            dict: frames, dropped, fps and "phases": phase -> {count, mean,
+            p50, p95, p99, max} in milliseconds. A phase's count is the
+            frames it ran in (draws only run when a widget changed).
+        """
+        phases = {}
+        for phase, samples in self._history.items():
+            ordered = sorted(samples)
+            n = len(ordered)
+            phases[phase] = {
+                "count": n,
+                "mean": sum(ordered) / n,
+                "p50": ordered[(n - 1) // 2],
+                "p95": ordered[int(0.95 * (n - 1))],
+                "p99": ordered[int(0.99 * (n - 1))],
+                "max": ordered[-1],
+            }
+        frame = phases.get("frame")
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "fps": 1000 / frame["mean"] if frame and frame["mean"] else 0.0,
+            "phases": phases,
+        }
+
+    def overlay_lines(self):
+        """Text for the on-screen overlay: frame percentiles, drops, slowest phases."""
+        stats = self.stats()
+        phases = stats["phases"]
+        if "frame" not in phases:
+            return ("profiler: waiting for frames",)
+        frame, work = phases["frame"], phases["work"]
+        lines = [
+            f"FPS {stats['fps']:5.1f}   dropped {stats['dropped']}/{stats['frames']}",
+            f"frame p50 {frame['p50']:5.1f} p95 {frame['p95']:5.1f} p99 {frame['p99']:5.1f}",
+            f"work  p50 {work['p50']:5.2f} p95 {work['p95']:5.2f} p99 {work['p99']:5.2f}",
+            f"{'phase (ms)':<15}{'p50':>6}{'p95':>7}{'p99':>7}",
+        ]
+        slowest = sorted((name for name in phases if name not in ("frame", "work", "idle")),
+                         key=lambda name: phases[name]["p95"], reverse=True)
+        for name in slowest[:PROFILER_OVERLAY_LINES - len(lines)]:
+            p = phases[name]
+            lines.append(f"{name:<15}{p['p50']:6.2f}{p['p95']:7.2f}{p['p99']:7.2f}")
+        return tuple(lines)
+
+    def write_trace(self, path):
+        """
+        Write the traced frames for offline analysis.
+
+        A path ending in .csv gets one row per frame and one column per
+        phase (0 when the phase did not run); anything else gets JSON with
+        the rolling stats and a list of per-frame phase timings.
+        """
+        import csv
+        import json
+
+        frames = list(self._trace or ())
+        if path.lower().endswith(".csv"):
+            columns = sorted({phase for _, _, phases in frames for phase in phases})
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "start_s"] + [f"{c}_ms" for c in columns])
+                for number, start, phases in frames:
+                    writer.writerow([number, f"{start:.6f}"] + [f"{phases.get(c, 0.0):.4f}" for c in columns])
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "target_ms": self.target_ms,
+                    "summary": self.stats(),
+                    "frames": [{"frame": number, "start_s": start, "phases_ms": phases}
+                               for number, start, phases in frames],
+                }, f, indent=1)
+
+
+# Frame rate while the player is typing/clicking or a reply is streaming in
+ACTIVE_FPS = 30
+
+# Seconds the loop stays at ACTIVE_FPS after the last input
+ACTIVE_GRACE_SECONDS = 0.5
+
+# Longest idle sleep, in case no timer is due
+IDLE_MAX_WAIT_SECONDS = 5.0
+
+
+def _wait_for_events(timeout):
+    """
+    Sleep until an event arrives or timeout seconds have passed.
+
+    Returns:
+        list: The pending events (empty on timeout).
+    """
+    timeout_ms = max(1, math.ceil(min(timeout, IDLE_MAX_WAIT_SECONDS) * 1000))
+    first = pygame.event.wait(timeout_ms)
+    if first.type == pygame.NOEVENT:
+        return []
+    return [first] + pygame.event.get()
+
+
+def run_pygame_game(responder=None, profiler=None):
     """
     Run the FNAF AI game with a pygame graphical interface.
 
+    AI replies are fetched on a background AIWorker, so the window keeps
+    rendering (and power keeps draining) while a reply is on its way.
+
+    The loop runs at ACTIVE_FPS only while the player is giving input or a
+    reply is streaming in. Otherwise it sleeps in pygame.event.wait until
+    the next event or the next due timer (power drain, animatronic move,
+    profiler overlay refresh), and the night is stepped by wall-clock time,
+    so timers stay accurate however long it slept.
+
+    Args:
+        responder (callable): Optional replacement for ai_response_stream
+            (returning a str or yielding pieces), e.g. a local stub for testing.
+        profiler (FrameProfiler): Optional profiler to use; by default one is
+            created, tracing when FNAF_PROFILE_TRACE names a .json/.csv file.
+
     Controls:
         Click a camera button  – switch to that camera view
         Type in the text box   – send a message to the active animatronic
         Enter                  – submit message
+        F3                     – show/hide the frame profiler overlay
         ESC / close window     – quit
     """
-    if not PYGAME_AVAILABLE:
+    if not backend_available("pygame"):
         print("❌ pygame is not installed. Run: pip install pygame")
         return
 
     pygame.init()
-    _init_mixer()
+    tone_bank.load()
 
     width, height = 800, 600
     screen = pygame.display.set_mode((width, height))
@@ -236,41 +1728,74 @@ def run_pygame_game():
     small_font = pygame.font.SysFont("monospace", 15)
     big_font   = pygame.font.SysFont("monospace", 28, bold=True)
 
-    cameras = ["CAM 1", "CAM 2", "CAM 3", "CAM 4", "CAM 5"]
+    cameras = list(CAMERAS)
     current_cam = "CAM 1"
 
-    # Starting positions for each animatronic
-    animatronic_locations = {
-        "Freddy": "CAM 1",
-        "Bonnie": "CAM 2",
-        "Chica":  "CAM 3",
-    }
-
-    messages = ["[System] FNAF AI Night started. Type to interact!"]
+    # Movement, power and blackout run in the headless night engine
+    night_sim = NightSimulation()
+    # Animatronics remember one night; earlier nights' replies stay in response_cache
+    conversation_memory.reset()
+    animatronic_locations = night_sim.locations
+
+    # Recent lines stay in memory; FNAF_TRANSCRIPT_DIR also keeps the whole night on disk
+    transcript_dir = os.environ.get("FNAF_TRANSCRIPT_DIR")
+    transcript = None
+    if transcript_dir:
+        transcript = TranscriptWriter(TranscriptArchive.new_night_path(transcript_dir))
+    messages = MessageLog(transcript=transcript)
+    messages.append("[System] FNAF AI Night started. Type to interact!")
     text_input = ""
-    power = 100
+    power = night_sim.power
     night = 1
-    move_timer = 0
-    power_timer = 0
     running = True
-    # Cache camera button rects so mouse hit-testing doesn't trigger extra draws
-    cam_rects = {}
+    # Button rects are fixed, so mouse hit-testing needs no drawing
+    cam_rects = _camera_button_rects(cameras)
+    trace_path = os.environ.get("FNAF_PROFILE_TRACE")
+    profiler = profiler or FrameProfiler(target_fps=ACTIVE_FPS, trace=bool(trace_path))
+    show_profiler = False
+    profiler_lines = ()
+    profiler_refresh = 0.0
+    hud = _build_hud(width, height, cameras, font, small_font, big_font, profiler)
+    ai_worker = AIWorker(responder)
+    pending_replies = []
 
     validate_api_key()
 
+    # Hovering changes nothing on screen, so mouse motion should not wake the loop
+    pygame.event.set_blocked(pygame.MOUSEMOTION)
+    last_input = -ACTIVE_GRACE_SECONDS
+    stepped_at = time.monotonic()
+
     while running:
-        dt = clock.tick(30)  # 30 FPS; dt in ms
-        move_timer  += dt
-        power_timer += dt
+        profiler.begin_frame()
+        # --- Wait: fixed frame rate while active, otherwise until the next event or timer ---
+        if pending_replies or time.monotonic() - last_input < ACTIVE_GRACE_SECONDS:
+            clock.tick(ACTIVE_FPS)
+            events = pygame.event.get()
+        else:
+            timeout = night_sim.time_to_next_event()
+            if show_profiler:
+                timeout = min(timeout, profiler_refresh - time.monotonic())
+            events = _wait_for_events(timeout)
+        profiler.lap("idle")
 
         # --- Events ---
-        for event in pygame.event.get():
+        for event in events:
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                last_input = time.monotonic()
+
             if event.type == pygame.QUIT:
                 running = False
 
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                hud.invalidate()  # window contents were lost, e.g. after un-minimizing
+
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
+                elif event.key == pygame.K_F3:
+                    show_profiler = not show_profiler
+                    profiler_refresh = 0.0
                 elif event.key == pygame.K_RETURN:
                     if text_input.strip():
                         user_msg = text_input.strip()
@@ -279,10 +1804,11 @@ def run_pygame_game():
                         present = [n for n, loc in animatronic_locations.items()
                                    if loc == current_cam]
                         animatronic = present[0] if present else random.choice(animatronics)
-                        play_sound_pygame(frequency=300, duration_ms=200)
-                        resp = ai_response(animatronic, user_msg)
+                        play_cue("message")
                         messages.append(f"You: {user_msg}")
-                        messages.append(f"{animatronic}: {resp}")
+                        seq = messages.append(f"{animatronic}: {_TYPING_PLACEHOLDER}", final=False)
+                        reply = ai_worker.submit(animatronic, user_msg)
+                        pending_replies.append((reply, seq, animatronic))
                 elif event.key == pygame.K_BACKSPACE:
                     text_input = text_input[:-1]
                 else:
@@ -293,107 +1819,475 @@ def run_pygame_game():
                 for cam, rect in cam_rects.items():
                     if rect.collidepoint(event.pos):
                         current_cam = cam
-                        play_sound_pygame(frequency=500, duration_ms=100)
-
-        # --- Logic: animatronic movement every 8 seconds ---
-        if move_timer >= 8000:
-            move_timer = 0
-            mover = random.choice(animatronics)
-            new_cam = random.choice(cameras)
-            animatronic_locations[mover] = new_cam
-            messages.append(f"[!] {mover} moved to {new_cam}!")
-            play_sound_pygame(frequency=200, duration_ms=400)
-
-        # --- Logic: power drain every second ---
-        if power_timer >= 1000:
-            power_timer = 0
-            power = max(0, power - 1)
-
-        if power == 0:
-            messages.append("[BLACKOUT] Power is out! Game over!")
-            running = False
-
-        # --- Drawing ---
-        screen.fill(_DARK)
-
-        # Title bar
-        title = big_font.render(f"FNAF AI Night  |  Night {night}  |  🔋 Power: {power}%", True, _WHITE)
-        screen.blit(title, (20, 8))
-
-        cam_rects = _draw_camera_buttons(screen, cameras, current_cam, small_font)
-        _draw_camera_view(screen, current_cam, animatronic_locations, font)
-        _draw_power_bar(screen, power, font)
-        _draw_message_log(screen, messages, small_font)
-
-        # Text input box
-        input_rect = pygame.Rect(50, height - 40, width - 100, 30)
-        pygame.draw.rect(screen, _GREY, input_rect)
-        pygame.draw.rect(screen, _WHITE, input_rect, 1)
-        input_text = small_font.render(f"> {text_input}_", True, _GREEN)
-        screen.blit(input_text, (input_rect.x + 5, input_rect.y + 7))
-
-        pygame.display.flip()
-
+                        play_cue("camera_switch")
+
+        profiler.lap("events")
+
+        # --- AI reply text that streamed in since the last frame ---
+        _collect_replies(pending_replies, messages)
+        profiler.lap("ai")
+
+        # --- Logic: animatronic moves every 8 seconds, power drain every second ---
+        now = time.monotonic()
+        sim_events = night_sim.step(now - stepped_at)
+        stepped_at = now
+        for sim_event in sim_events:
+            if sim_event.kind == "move":
+                messages.append(f"[!] {sim_event.animatronic} moved to {sim_event.camera}!")
+                play_cue("movement")
+            elif sim_event.kind == "blackout":
+                messages.append("[BLACKOUT] Power is out! Game over!")
+                running = False
+        power = night_sim.power
+        if show_profiler and time.monotonic() >= profiler_refresh:
+            profiler_lines = profiler.overlay_lines()
+            profiler_refresh = time.monotonic() + 0.5
+        profiler.lap("logic")
+
+        # --- Drawing: only widgets whose inputs changed, only their rects ---
+        dirty_rects = hud.render(screen, {
+            "title":   (night, power),
+            "buttons": (current_cam,),
+            "camera":  (current_cam, tuple(animatronic_locations.items())),
+            "power":   (power,),
+            "log":     (messages.tail(3),),
+            "input":   (text_input,),
+            "profiler": (profiler_lines if show_profiler else (),),
+        })
+        profiler.lap("draw")
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+        profiler.lap("flip")
+
+    profiler.end_frame()
+    if trace_path and profiler.tracing:
+        profiler.write_trace(trace_path)
+        print(f"📈 Frame trace written to {trace_path}")
+    ai_worker.shutdown()
+    messages.close()
+    audio_manager.shutdown()
     pygame.quit()
 
 
+# ==================== CONVERSATION MEMORY ====================
+
+# Most prompt tokens per AI request (system prompt, summary, history and the new message)
+PROMPT_TOKEN_BUDGET = 700
+
+# Recent exchanges kept word for word; older ones are folded into the summary
+MEMORY_WINDOW_TURNS = 6
+
+# Most tokens the summary of older exchanges may take
+SUMMARY_TOKEN_BUDGET = 150
+
+# Chat-format overhead of one message (role and separators), in tokens
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+PromptRecord = namedtuple("PromptRecord", ["animatronic", "tokens", "api_tokens", "turns", "summarized"])
+PromptRecord.__doc__ = """
+Size of one AI request's prompt
+
+    animatronic: Who was asked
+    tokens: Estimated prompt tokens (the figure the budget is enforced on)
+    api_tokens: Prompt tokens reported by the API, when it reports them
+    turns: Exchanges sent word for word
+    summarized: Exchanges folded into the summary so far
+"""
+
+
+def estimate_tokens(text):
+    """Rough token count of text: about four characters per token for English."""
+    return len(text) // 4 + 1
+
+
+@lru_cache(maxsize=None)
+def _system_prompt(animatronic):
+    """The animatronic's system prompt, identical on every call so the API can reuse the cached prefix."""
+    return f"You are {animatronic} from Five Nights at Freddy's. Be spooky and menacing but family-friendly."
+
+
+def _clip(text, limit):
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+class Conversation:
+    """
+    One animatronic's memory of the night.
+
+    The last window_turns exchanges are sent word for word. Older exchanges
+    are folded into a summary message of clipped lines, which is rebuilt
+    only when an exchange is folded in, so between foldings the prompt
+    prefix (system prompt + summary) stays byte-identical across requests.
+
+    Args:
+        animatronic (str): Whose memory this is.
+        window_turns (int): Exchanges kept word for word.
+        summary_tokens (int): Token limit of the summary; the oldest notes
+            are dropped beyond it.
+    """
+
+    def __init__(self, animatronic, window_turns=MEMORY_WINDOW_TURNS,
+                 summary_tokens=SUMMARY_TOKEN_BUDGET):
+        self.animatronic = animatronic
+        self.window_turns = window_turns
+        self.summary_tokens = summary_tokens
+        self.turns = deque()   # (player_input, reply, tokens), oldest first
+        self.summarized = 0
+        self._notes = deque()
+        self._summary = None   # cached summary message, or None
+        self._summary_tokens = 0
+
+    @property
+    def empty(self):
+        """True while nothing is remembered, word for word or summarized."""
+        return not self.turns and self._summary is None
+
+    def digest(self):
+        """Hash of everything remembered ("" while empty); equal digests send equal history."""
+        if self.empty:
+            return ""
+        state = [self._summary["content"] if self._summary else ""]
+        for player, reply, _ in self.turns:
+            state += [_normalize_prompt(player), reply]
+        return hashlib.sha256("\0".join(state).encode("utf-8")).hexdigest()
+
+    def record(self, player_input, reply):
+        """Remember one finished exchange."""
+        tokens = estimate_tokens(player_input) + estimate_tokens(reply) + 2 * _MESSAGE_OVERHEAD_TOKENS
+        self.turns.append((player_input, reply, tokens))
+        while len(self.turns) > self.window_turns:
+            self._fold_oldest()
+
+    def messages(self, player_input, budget):
+        """
+        Chat messages for a new player message, compacted to fit budget.
+
+        Old exchanges are folded into the summary, then the oldest summary
+        notes dropped, until the prompt fits (the system prompt and the new
+        message are always sent).
+
+        Returns:
+            tuple: (messages, estimated prompt tokens)
+        """
+        system = _system_prompt(self.animatronic)
+        fixed = estimate_tokens(system) + estimate_tokens(player_input) + 2 * _MESSAGE_OVERHEAD_TOKENS
+        history = sum(tokens for _, _, tokens in self.turns)
+        while self.turns and fixed + self._summary_tokens + history > budget:
+            history -= self.turns[0][2]
+            self._fold_oldest()
+        while self._notes and fixed + self._summary_tokens + history > budget:
+            self._notes.popleft()
+            self._rebuild_summary()
+
+        messages = [{"role": "system", "content": system}]
+        if self._summary is not None:
+            messages.append(self._summary)
+        for player, reply, _ in self.turns:
+            messages.append({"role": "user", "content": player})
+            messages.append({"role": "assistant", "content": reply})
+        messages.append({"role": "user", "content": player_input})
+        return messages, fixed + self._summary_tokens + history
+
+    def _fold_oldest(self):
+        player, reply, _ = self.turns.popleft()
+        self.summarized += 1
+        self._notes.append(f'- the player said "{_clip(player, 60)}", you said "{_clip(reply, 60)}"')
+        self._rebuild_summary()
+
+    def _rebuild_summary(self):
+        header = "Earlier tonight (oldest first):"
+        content = "\n".join([header, *self._notes])
+        while self._notes and estimate_tokens(content) > self.summary_tokens:
+            self._notes.popleft()
+            content = "\n".join([header, *self._notes])
+        if self._notes:
+            self._summary = {"role": "system", "content": content}
+            self._summary_tokens = estimate_tokens(content) + _MESSAGE_OVERHEAD_TOKENS
+        else:
+            self._summary = None
+            self._summary_tokens = 0
+
+
+class ConversationMemory:
+    """
+    Per-animatronic Conversations under one prompt-token budget.
+
+    prompt() builds a request's messages, record() stores the finished
+    exchange and log_request() keeps the size of every prompt sent (see
+    stats()), so prompt growth over a long night is visible. Thread-safe:
+    the AIWorker runs requests on several threads.
+
+    Args:
+        token_budget (int): Most estimated prompt tokens per request.
+        window_turns (int): Exchanges per animatronic kept word for word.
+        summary_tokens (int): Token limit of each animatronic's summary.
+        history (int): Prompt records kept for stats().
+    """
+
+    def __init__(self, token_budget=PROMPT_TOKEN_BUDGET, window_turns=MEMORY_WINDOW_TURNS,
+                 summary_tokens=SUMMARY_TOKEN_BUDGET, history=1000):
+        self.token_budget = token_budget
+        self.window_turns = window_turns
+        self.summary_tokens = summary_tokens
+        self.log = deque(maxlen=history)
+        self._conversations = {}
+        self._lock = threading.Lock()
+
+    def _conversation(self, animatronic):
+        conversation = self._conversations.get(animatronic)
+        if conversation is None:
+            conversation = self._conversations[animatronic] = Conversation(
+                animatronic, self.window_turns, self.summary_tokens)
+        return conversation
+
+    def prompt(self, animatronic, player_input):
+        """Messages for a new player message; returns (messages, estimated tokens)."""
+        with self._lock:
+            return self._conversation(animatronic).messages(player_input, self.token_budget)
+
+    def record(self, animatronic, player_input, reply):
+        """Remember a finished exchange with animatronic."""
+        with self._lock:
+            self._conversation(animatronic).record(player_input, reply)
+
+    def log_request(self, animatronic, tokens, api_tokens=None):
+        """Log the prompt size of one request sent to the API."""
+        with self._lock:
+            conversation = self._conversation(animatronic)
+            self.log.append(PromptRecord(animatronic, tokens, api_tokens,
+                                         len(conversation.turns), conversation.summarized))
+
+    def context_key(self, animatronic):
+        """Digest of animatronic's conversation for ResponseCache keys ("" with no history)."""
+        with self._lock:
+            conversation = self._conversations.get(animatronic)
+            return conversation.digest() if conversation is not None else ""
+
+    def reset(self, animatronic=None):
+        """Forget one animatronic's conversation, or every conversation."""
+        with self._lock:
+            if animatronic is None:
+                self._conversations.clear()
+            else:
+                self._conversations.pop(animatronic, None)
+
+    def stats(self):
+        """
+        Prompt sizes of the logged requests.
+
+        Returns:
+            dict: requests, mean/max/last estimated tokens, mean API-reported
+            tokens (None if the API never reported usage) and the budget.
+        """
+        with self._lock:
+            records = list(self.log)
+        reported = [record.api_tokens for record in records if record.api_tokens is not None]
+        return {
+            "requests": len(records),
+            "mean_tokens": sum(r.tokens for r in records) / len(records) if records else None,
+            "max_tokens": max((r.tokens for r in records), default=None),
+            "last": records[-1] if records else None,
+            "mean_api_tokens": sum(reported) / len(reported) if reported else None,
+            "budget": self.token_budget,
+        }
+
+
+# Shared memory used by ai_response. FNAF_PROMPT_BUDGET sets its token budget.
+conversation_memory = ConversationMemory(
+    token_budget=int(os.environ.get("FNAF_PROMPT_BUDGET", PROMPT_TOKEN_BUDGET)))
+
+# Memory that remembers nothing: every prompt is the system prompt plus the
+# new message (used where replies are shared between players)
+stateless_memory = ConversationMemory(window_turns=0, summary_tokens=0, history=0)
+
+
 # ==================== GAME FUNCTIONS ====================
 
-def ai_response(animatronic, player_input):
+def _create_completion(messages, **options):
+    """Send one chat-completion request with whichever OpenAI API is installed."""
+    # Using the newer ChatCompletion API (recommended)
+    # Note: text-davinci-003 is deprecated. Use gpt-3.5-turbo or gpt-4 instead
+    request = dict(
+        model="gpt-3.5-turbo",
+        messages=messages,
+        max_tokens=50,
+        temperature=0.8,
+        **options
+    )
+    client = get_ai_client()
+    if client:
+        # New client-based API (openai >= 1.0.0), behind the resilient client layer
+        return client.create(**request)
+    # Legacy API (openai < 1.0.0)
+    return openai.ChatCompletion.create(**request)
+
+
+def _error_message(error):
+    """Turn an API exception into the in-game error text."""
+    # Handle both old and new API error types
+    error_msg = str(error)
+    if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
+        return f"[ERROR: Invalid API key. Please set your OPENAI_API_KEY environment variable]"
+    elif "rate limit" in error_msg.lower():
+        return f"[ERROR: Rate limit exceeded. Please try again later]"
+    else:
+        return f"[ERROR: {error_msg}]"
+
+
+def _demo_reply(animatronic):
+    """Canned reply used without OpenAI or while the AI backend is down."""
+    return f"[DEMO] I'm {animatronic}... watching you... 🐻👁️"
+
+
+def ai_response(animatronic, player_input, memory=None):
     """
     Generate an AI response from an animatronic character.
+
+    The animatronic remembers the night's earlier exchanges through memory
+    (recent ones word for word, older ones summarized, within a prompt
+    token budget). response_cache is keyed on the prompt plus a digest of
+    that memory, so a cached reply is only served to a conversation in the
+    same state as the one it was written for. Openers, with no history,
+    hit the most; later prompts hit when a night replays an earlier one,
+    which happens because the game resets the memory every night and
+    cached openers come from a few variants. The price is one cache entry
+    per distinct conversation state, so most mid-night keys are used once
+    and age out of the LRU; sharing replies across any history would hit
+    more but answer out of context.
     
     Args:
         animatronic (str): Name of the animatronic character
         player_input (str): Player's input text
+        memory (ConversationMemory): Conversation state to use (default
+            conversation_memory; stateless_memory for none)
     
     Returns:
-        str: AI-generated spooky response
-    
-    Raises:
-        Exception: If API call fails
+        str: AI-generated spooky response (or an "[ERROR: ...]" message)
     """
-    if not OPENAI_AVAILABLE:
-        return f"[DEMO] I'm {animatronic}... watching you... 🐻👁️"
+    if not backend_available("openai"):
+        return _demo_reply(animatronic)
+    memory = conversation_memory if memory is None else memory
+
+    # Cached replies were written for this exact conversation state
+    context = memory.context_key(animatronic)
+    cached = response_cache.get(animatronic, player_input, context)
+    if cached is not None:
+        memory.record(animatronic, player_input, cached)
+        return cached
     
+    messages, tokens = memory.prompt(animatronic, player_input)
+    api_tokens = None
     try:
-        # Using the newer ChatCompletion API (recommended)
-        # Note: text-davinci-003 is deprecated. Use gpt-3.5-turbo or gpt-4 instead
-        
-        if openai_client:
-            # New client-based API (openai >= 1.0.0)
-            response = openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": f"You are {animatronic} from Five Nights at Freddy's. Be spooky and menacing but family-friendly."},
-                    {"role": "user", "content": player_input}
-                ],
-                max_tokens=50,
-                temperature=0.8
-            )
-            return response.choices[0].message.content.strip()
-        else:
-            # Legacy API (openai < 1.0.0)
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": f"You are {animatronic} from Five Nights at Freddy's. Be spooky and menacing but family-friendly."},
-                    {"role": "user", "content": player_input}
-                ],
-                max_tokens=50,
-                temperature=0.8
-            )
-            return response.choices[0].message.content.strip()
-    
+        response = _create_completion(messages)
+        reply = response.choices[0].message.content.strip()
+        api_tokens = getattr(getattr(response, "usage", None), "prompt_tokens", None)
+    except CircuitOpenError:
+        return _demo_reply(animatronic)
     except Exception as e:
-        # Handle both old and new API error types
-        error_msg = str(e)
-        if "authentication" in error_msg.lower() or "api key" in error_msg.lower():
-            return f"[ERROR: Invalid API key. Please set your OPENAI_API_KEY environment variable]"
-        elif "rate limit" in error_msg.lower():
-            return f"[ERROR: Rate limit exceeded. Please try again later]"
-        else:
-            return f"[ERROR: {error_msg}]"
+        return _error_message(e)
+    finally:
+        memory.log_request(animatronic, tokens, api_tokens)
+    response_cache.put(animatronic, player_input, reply, context)
+    memory.record(animatronic, player_input, reply)
+    return reply
+
+
+class StreamStats:
+    """
+    Time-to-first-token and total generation time of streamed replies.
+
+    Attributes:
+        requests (int): Streamed replies measured so far.
+        last_ttft (float): Seconds until the first token of the last reply.
+        last_total (float): Seconds until the last reply was complete.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.last_ttft = None
+        self.last_total = None
+        self._ttft_sum = 0.0
+
+    def record(self, ttft, total):
+        """Record one streamed reply."""
+        self.requests += 1
+        self.last_ttft = ttft
+        self.last_total = total
+        self._ttft_sum += ttft
+
+    def mean_ttft(self):
+        """Average time-to-first-token in seconds (None before any request)."""
+        return self._ttft_sum / self.requests if self.requests else None
+
+
+stream_stats = StreamStats()
+
+
+def ai_response_stream(animatronic, player_input, memory=None):
+    """
+    Stream an AI response from an animatronic character as it is generated.
+
+    Yields text pieces as soon as the API sends them, so the first words can
+    be shown after the time-to-first-token rather than the full generation
+    time (see stream_stats). Cached replies arrive as a single piece. The
+    conversation memory and response_cache work as in ai_response.
+
+    Args:
+        animatronic (str): Name of the animatronic character
+        player_input (str): Player's input text
+        memory (ConversationMemory): Conversation state to use (default
+            conversation_memory)
+
+    Yields:
+        str: Consecutive pieces of the reply (or one "[ERROR: ...]" message)
+    """
+    if not backend_available("openai"):
+        yield _demo_reply(animatronic)
+        return
+    memory = conversation_memory if memory is None else memory
+
+    # Cached replies were written for this exact conversation state
+    context = memory.context_key(animatronic)
+    cached = response_cache.get(animatronic, player_input, context)
+    if cached is not None:
+        memory.record(animatronic, player_input, cached)
+        yield cached
+        return
+
+    messages, tokens = memory.prompt(animatronic, player_input)
+    api_tokens = None
+    started = time.perf_counter()
+    first_token_at = None
+    parts = []
+    try:
+        for chunk in _create_completion(messages, stream=True):
+            # Servers that report usage on streams send it with the last chunk
+            api_tokens = getattr(getattr(chunk, "usage", None), "prompt_tokens", api_tokens)
+            if not chunk.choices:
+                continue
+            piece = getattr(chunk.choices[0].delta, "content", None)
+            if not parts and piece:
+                piece = piece.lstrip()
+            if not piece:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            parts.append(piece)
+            yield piece
+    except CircuitOpenError:
+        yield _demo_reply(animatronic)
+        return
+    except Exception as e:
+        yield _error_message(e)
+        return
+    finally:
+        memory.log_request(animatronic, tokens, api_tokens)
+
+    reply = "".join(parts).strip()
+    if reply:
+        stream_stats.record(first_token_at - started, time.perf_counter() - started)
+        response_cache.put(animatronic, player_input, reply, context)
+        memory.record(animatronic, player_input, reply)
 
 
 def validate_api_key():
@@ -403,7 +2297,8 @@ def validate_api_key():
     Returns:
         bool: True if API key appears to be set, False otherwise
     """
-    if not OPENAI_AVAILABLE:
+    # find_spec only: the text modes should not pay for importing openai up front
+    if not backend_installed("openai"):
         print("⚠️  WARNING: OpenAI module not installed!")
         print("Install it with: pip install openai")
         print("Running in demo mode...\n")
@@ -438,6 +2333,7 @@ def play_game():
         print(f"\n{'='*50}")
         print(f"🌙 --- Night {night} --- 🌙")
         print(f"{'='*50}\n")
+        conversation_memory.reset()
         
         # Inner loop for player interactions
         while True:
@@ -461,9 +2357,11 @@ def play_game():
                 time.sleep(1)
                 print(" 👻")
                 
-                # Get and display AI response
-                response = ai_response(animatronic, player_input)
-                print(f"{animatronic}: {response}\n")
+                # Stream the AI response as it is generated
+                print(f"{animatronic}: ", end="", flush=True)
+                for piece in ai_response_stream(animatronic, player_input):
+                    print(piece, end="", flush=True)
+                print("\n")
                 
             except KeyboardInterrupt:
                 print("\n\n🚪 Game interrupted. Exiting...")
@@ -503,13 +2401,129 @@ def demo_mode():
                 
                 animatronic = random.choice(animatronics)
                 print(f"\n{animatronic} is approaching... 👻")
-                print(f"{animatronic}: [DEMO] I'm {animatronic}... watching you... 🐻👁️\n")
+                print(f"{animatronic}: {_demo_reply(animatronic)}\n")
                 
             except (KeyboardInterrupt, EOFError):
                 print("\n\n🚪 Demo interrupted. Exiting...")
                 return
 
 
+# ==================== TRANSCRIPT REPLAY ====================
+
+def replay_transcript(night=None, page=0, page_size=20):
+    """
+    Print recorded nights (FNAF_TRANSCRIPT_DIR), or one page of a night.
+
+    Args:
+        night (str): Night name as listed; None lists the nights.
+        page (int): Page number, from 0.
+        page_size (int): Lines per page.
+    """
+    archive = TranscriptArchive(os.environ.get("FNAF_TRANSCRIPT_DIR", "transcripts"))
+    if night is None:
+        nights = archive.nights()
+        print("\n".join(nights) if nights else f"No transcripts in {archive.directory}")
+        return
+    page = int(page)
+    lines = archive.page(night, page, page_size)
+    print(f"📜 {night} – page {page}")
+    for line in lines:
+        print(f"{time.strftime('%H:%M:%S', time.localtime(line.time))}  {line.text}")
+    if len(lines) == page_size:
+        print(f"   more: --replay {night} {page + 1}")
+
+
+# ==================== STARTUP PROFILING ====================
+
+# Seconds each launch mode may take from interpreter start to its first prompt
+STARTUP_BUDGETS = {"demo": 0.25, "text": 0.25}
+
+# What each launch mode runs before its first prompt; "quit" on stdin ends it there
+_STARTUP_MODES = {
+    "import": "import fnaf_ai_game",
+    "demo": "import fnaf_ai_game as game; game.demo_mode()",
+    "text": "import fnaf_ai_game as game; game.play_game()",
+}
+
+
+def startup_report(mode="demo"):
+    """
+    Profile one launch mode in a fresh interpreter, as python -X importtime does.
+
+    The mode runs in a child process with "quit" on stdin, so the figures
+    cover interpreter start, every import and the mode's setup up to its
+    first prompt.
+
+    Args:
+        mode (str): "import", "demo" or "text".
+
+    Returns:
+        dict: "wall" seconds for the whole child, "imports" seconds spent
+        importing, and "modules": (module, cumulative s, self s, depth)
+        tuples, slowest first.
+    """
+    import subprocess  # only the report needs it; keep it off the startup path
+
+    started = time.perf_counter()
+    child = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _STARTUP_MODES[mode]],
+        cwd=os.path.dirname(os.path.abspath(__file__)), input="quit\n",
+        capture_output=True, text=True,
+        env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"))
+    wall = time.perf_counter() - started
+    if child.returncode != 0:
+        raise RuntimeError(f"{mode} mode failed to start:\n{child.stderr[-2000:]}")
+
+    modules = []
+    for line in child.stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("imported package"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.append((name.strip(), int(cumulative_us) / 1e6, int(self_us) / 1e6, depth))
+    imports = sum(cumulative for _, cumulative, _, depth in modules if depth == 0)
+    modules.sort(key=lambda module: module[1], reverse=True)
+    return {"mode": mode, "wall": wall, "imports": imports, "modules": modules}
+
+
+def print_startup_report(mode="demo", top=15):
+    """Print startup_report(mode) with its slowest imports."""
+    report = startup_report(mode)
+    print(f"⏱️  {mode} mode: {report['wall'] * 1000:.0f} ms to first prompt, "
+          f"{report['imports'] * 1000:.0f} ms of it importing")
+    print(f"   {'cumulative':>10}  {'self':>8}  module")
+    for name, cumulative, own, depth in report["modules"][:top]:
+        print(f"   {cumulative * 1000:8.1f}ms  {own * 1000:6.1f}ms  {name}")
+
+
+def check_startup_budget(budgets=None, runs=3):
+    """
+    Check that each launch mode reaches its first prompt within its budget.
+
+    The best of several runs is compared, so a briefly busy machine does
+    not fail the check; a failing mode also lists its slowest imports.
+
+    Args:
+        budgets (dict): Mode -> seconds (default STARTUP_BUDGETS).
+        runs (int): Launches per mode.
+
+    Returns:
+        bool: True if every mode is within budget.
+    """
+    within_all = True
+    for mode, budget in (budgets or STARTUP_BUDGETS).items():
+        best = min((startup_report(mode) for _ in range(runs)), key=lambda report: report["wall"])
+        within = best["wall"] <= budget
+        within_all = within_all and within
+        print(f"{'✅' if within else '❌'} {mode} mode starts in {best['wall'] * 1000:.0f} ms "
+              f"(budget {budget * 1000:.0f} ms)")
+        if not within:
+            slowest = [module for module in best["modules"] if module[3] == 0][:5]
+            print("   slowest imports: " + ", ".join(
+                f"{name} {cumulative * 1000:.0f} ms" for name, cumulative, _, _ in slowest))
+    return within_all
+
+
 # ==================== MAIN ====================
 
 def main():
@@ -518,15 +2532,35 @@ def main():
 
     Environment variables:
         FNAF_DEMO_MODE=1    – run the text-only demo mode
-        FNAF_PYGAME_MODE=1  – run the pygame graphical mode (default when pygame is available)
+        FNAF_PYGAME_MODE=1  – run the pygame graphical mode (default when pygame is installed)
+        FNAF_TEXT_MODE=1    – run the text chat mode even when pygame is installed
+        FNAF_PROFILE_TRACE=frames.json – record per-frame phase timings (.json or .csv)
+        FNAF_TRANSCRIPT_DIR=dir – save each night's message log to dir (gzip JSON lines)
+        FNAF_PROMPT_BUDGET=700 – prompt-token budget of each animatronic's conversation memory
+        FNAF_CACHE_DB=path  – keep cached AI replies in this SQLite file across runs
+        FNAF_AI_RPM=60      – AI request quota per minute (token-bucket rate limit)
+
+    Command line:
+        --startup-report [import|demo|text]  – time a launch mode and its imports
+        --check-startup                      – exit 1 if a mode exceeds STARTUP_BUDGETS
+        --replay [NIGHT [PAGE]]              – list recorded nights, or print a page of one
     """
     if os.environ.get("FNAF_DEMO_MODE") == "1":
         demo_mode()
-    elif os.environ.get("FNAF_PYGAME_MODE") == "1" or PYGAME_AVAILABLE:
+    elif os.environ.get("FNAF_TEXT_MODE") == "1":
+        play_game()
+    elif os.environ.get("FNAF_PYGAME_MODE") == "1" or backend_installed("pygame"):
         run_pygame_game()
     else:
         play_game()
 
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["--startup-report"]:
+        print_startup_report(*sys.argv[2:3])
+    elif sys.argv[1:2] == ["--check-startup"]:
+        sys.exit(0 if check_startup_budget() else 1)
+    elif sys.argv[1:2] == ["--replay"]:
+        replay_transcript(*sys.argv[2:4])
+    else:
+        main()
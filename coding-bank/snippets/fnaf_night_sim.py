@@ -0,0 +1,472 @@
+"""
+FNAF AI Night - Night Simulator
+===============================
+Headless, deterministic model of one FNAF AI night: an animatronic moves to a
+random camera on a fixed interval, power drains once a second and the night
+ends at blackout (or when an animatronic is caught, or at dawn, if the rules
+enable them).
+
+run_pygame_game and fnaf_server step the same engine in real time. For
+difficulty tuning it runs in simulated time instead: one night at a time
+(NightSimulation), thousands of nights over a process pool (simulate_nights)
+or thousands of nights at once as NumPy arrays (simulate_nights_numpy).
+
+Usage:
+    python fnaf_night_sim.py                          # 10,000 nights, game rules
+    python fnaf_night_sim.py 50000 --seed 7 --night-length 90 --attack-camera "CAM 5"
+
+Requirements:
+    pip install numpy   (only for simulate_nights_numpy)
+"""
+
+import argparse
+import math
+import random
+from collections import Counter, namedtuple
+from importlib.util import find_spec
+from itertools import chain, repeat
+
+CAMERAS = ["CAM 1", "CAM 2", "CAM 3", "CAM 4", "CAM 5"]
+ANIMATRONICS = ["Freddy", "Bonnie", "Chica"]
+
+# Where each animatronic stands when the night starts
+START_LOCATIONS = {"Freddy": "CAM 1", "Bonnie": "CAM 2", "Chica": "CAM 3"}
+
+# Nights per process-pool task in simulate_nights
+SIM_CHUNK_SIZE = 256
+
+NightRules = namedtuple(
+    "NightRules",
+    ["move_interval", "drain_interval", "drain", "start_power", "night_length", "attack_camera"],
+    defaults=(8.0, 1.0, 1, 100, None, None),
+)
+NightRules.__doc__ = """
+Tunable rules of one night; the defaults are the rules of the game
+
+    move_interval: Seconds between animatronic moves
+    drain_interval: Seconds between power drains
+    drain: Power percent lost per drain
+    start_power: Power percent at the start of the night
+    night_length: Seconds until dawn (None: the night only ends at blackout)
+    attack_camera: Camera that catches the player when an animatronic moves
+        onto it (None: animatronics never attack)
+"""
+
+NightEvent = namedtuple("NightEvent", ["time", "kind", "animatronic", "camera"])
+NightEvent.__doc__ = """
+One entry of a night's event trace
+
+    time: Simulated seconds since the start of the night
+    kind: "move", "caught", "blackout" or "dawn"
+    animatronic: Animatronic that moved or caught the player, else None
+    camera: Camera it moved to, else None
+"""
+
+NightResult = namedtuple("NightResult", ["survived", "cause", "end_time", "power", "trace", "occupancy"])
+NightResult.__doc__ = """
+Outcome of one simulated night
+
+    survived: True when the night ended at dawn
+    cause: "caught", "blackout" or "dawn"
+    end_time: Simulated seconds the night lasted
+    power: Power percent left at the end
+    trace: List of NightEvents, oldest first
+    occupancy: Dict animatronic -> {camera: seconds spent there}
+"""
+
+
+def _night_end_time(rules):
+    """Latest time a night can last under rules: blackout or dawn, whichever is first."""
+    blackout = math.inf
+    if rules.drain > 0:
+        blackout = max(1, math.ceil(rules.start_power / rules.drain)) * rules.drain_interval
+    dawn = math.inf if rules.night_length is None else rules.night_length
+    if blackout == math.inf and dawn == math.inf:
+        raise ValueError("rules never end the night: set drain > 0 or a night_length")
+    return blackout, dawn
+
+
+class NightSimulation:
+    """
+    Step-by-step simulation of one night, independent of rendering and wall time.
+
+    Timers are kept as absolute due times (move k happens at k * move_interval),
+    so stepping in 33 ms frames or in one jump gives the same night. Events
+    due at the same instant fire as the game loop orders them: move, then
+    power drain, then dawn.
+
+    Args:
+        rules (NightRules): Rules of the night (default: the game's rules).
+        seed: Seed for a private random.Random; ignored when rng is given.
+        rng (random.Random): Random source for moves, e.g. to share one.
+
+    Example:
+        >>> night = NightSimulation(seed=1)
+        >>> [e.kind for e in night.step(16)]
+        ['move', 'move']
+        >>> night.power
+        84
+    """
+
+    def __init__(self, rules=None, seed=None, rng=None):
+        self.rules = rules or NightRules()
+        self.rng = rng or random.Random(seed)
+        self.time = 0.0
+        self.power = self.rules.start_power
+        self.locations = dict(START_LOCATIONS)
+        self.trace = []
+        self.cause = None   # set once the night is over
+        self._moves = 0
+        self._drains = 0
+        self._occupancy = {name: Counter() for name in chain(START_LOCATIONS, ANIMATRONICS)}
+        self._tallied_to = 0.0
+
+    @property
+    def over(self):
+        """True once the night ended (caught, blackout or dawn)."""
+        return self.cause is not None
+
+    def step(self, seconds):
+        """
+        Advance simulated time.
+
+        Args:
+            seconds (float): Time to advance by.
+
+        Returns:
+            list: NightEvents that fired during the step, oldest first.
+        """
+        if self.over:
+            return []
+        target = self.time + seconds
+        fired = len(self.trace)
+        while not self.over:
+            next_move, next_drain, dawn = self._due_times()
+            due = min(next_move, next_drain, dawn)
+            if due > target:
+                break
+            if next_drain < min(next_move, dawn):
+                # Nothing but drains until the next move/dawn: apply them in one go
+                self._drain_until(min(next_move, dawn), target)
+                continue
+            self.time = due
+            if next_move == due:
+                self._move()
+            if not self.over and next_drain == due:
+                self._drain(1)
+            if not self.over and dawn == due:
+                self._end("dawn")
+        if not self.over:
+            self.time = target
+        self._tally()
+        return self.trace[fired:]
+
+    def time_to_next_event(self):
+        """Seconds until the next move, drain or dawn is due (inf once the night is over)."""
+        if self.over:
+            return math.inf
+        return max(0.0, min(self._due_times()) - self.time)
+
+    def _due_times(self):
+        """Absolute due times of the next move, the next drain and dawn."""
+        rules = self.rules
+        next_move = (self._moves + 1) * rules.move_interval
+        next_drain = (self._drains + 1) * rules.drain_interval if rules.drain > 0 else math.inf
+        dawn = math.inf if rules.night_length is None else rules.night_length
+        return next_move, next_drain, dawn
+
+    def run(self):
+        """Step until the night ends; returns its NightResult."""
+        _night_end_time(self.rules)   # refuse rules that would never end
+        self.step(math.inf)
+        return self.result()
+
+    def result(self):
+        """NightResult of the night so far."""
+        return NightResult(
+            survived=self.cause == "dawn",
+            cause=self.cause,
+            end_time=self.time,
+            power=self.power,
+            trace=list(self.trace),
+            occupancy={name: dict(cams) for name, cams in self._occupancy.items()},
+        )
+
+    def _tally(self):
+        """Credit the time since the last tally to each animatronic's camera."""
+        elapsed = self.time - self._tallied_to
+        if elapsed > 0:
+            for name, cam in self.locations.items():
+                self._occupancy[name][cam] += elapsed
+            self._tallied_to = self.time
+
+    def _move(self):
+        self._moves += 1
+        mover = self.rng.choice(ANIMATRONICS)
+        new_cam = self.rng.choice(CAMERAS)
+        self._tally()
+        self.locations[mover] = new_cam
+        self.trace.append(NightEvent(self.time, "move", mover, new_cam))
+        if new_cam == self.rules.attack_camera:
+            self._end("caught", mover, new_cam)
+
+    def _drain_until(self, before, until):
+        """Apply every drain due before `before` and by `until`, stopping at blackout."""
+        interval = self.rules.drain_interval
+        last = math.ceil(before / interval) - 1
+        if until != math.inf:
+            last = min(last, math.floor(until / interval))
+        to_blackout = math.ceil(self.power / self.rules.drain)
+        self._drain(min(max(1, last - self._drains), to_blackout))
+
+    def _drain(self, drains):
+        self._drains += drains
+        self.time = self._drains * self.rules.drain_interval
+        self.power = max(0, self.power - drains * self.rules.drain)
+        if self.power <= 0:
+            self._end("blackout")
+
+    def _end(self, cause, animatronic=None, camera=None):
+        self.cause = cause
+        self.trace.append(NightEvent(self.time, cause, animatronic, camera))
+
+
+def simulate_night(rules=None, seed=None):
+    """Simulate one whole night; returns its NightResult."""
+    return NightSimulation(rules, seed).run()
+
+
+class SimulationReport:
+    """
+    Aggregate outcome of many simulated nights.
+
+    Attributes:
+        rules (NightRules): Rules the nights ran under.
+        nights (int): Number of nights.
+        causes (Counter): Nights per ending ("caught", "blackout", "dawn").
+        end_times (list): Length of every night in seconds.
+        occupancy (dict): animatronic -> {camera: total seconds}, all nights.
+    """
+
+    def __init__(self, rules, causes, end_times, occupancy, trace):
+        self.rules = rules
+        self.nights = len(end_times)
+        self.causes = causes
+        self.end_times = end_times
+        self.occupancy = occupancy
+        self._trace = trace
+
+    @property
+    def survival_rate(self):
+        """Fraction of nights that reached dawn."""
+        return self.causes["dawn"] / self.nights if self.nights else 0.0
+
+    def trace(self, night):
+        """Event trace (list of NightEvents) of one night by index."""
+        return self._trace(night)
+
+    def occupancy_distribution(self):
+        """
+        Share of simulated time each animatronic spent on each camera.
+
+        Returns:
+            dict: animatronic -> {camera: fraction}, every camera listed.
+        """
+        distribution = {}
+        for name, cams in self.occupancy.items():
+            total = sum(cams.values())
+            distribution[name] = {cam: (cams.get(cam, 0.0) / total if total else 0.0)
+                                  for cam in CAMERAS}
+        return distribution
+
+    def summary(self):
+        """Headline numbers as a plain dict (survival, endings, night length)."""
+        ordered = sorted(self.end_times)
+
+        def quantile(q):
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+
+        return {
+            "nights": self.nights,
+            "survival_rate": self.survival_rate,
+            "causes": dict(self.causes),
+            "mean_end_time": sum(ordered) / len(ordered) if ordered else None,
+            "p05_end_time": quantile(0.05),
+            "p50_end_time": quantile(0.5),
+            "occupancy": self.occupancy_distribution(),
+        }
+
+
+def _simulate_chunk(rules, seeds):
+    """Simulate nights in a worker; returns only aggregates, so results pickle small."""
+    causes = Counter()
+    end_times = []
+    occupancy = {}
+    for seed in seeds:
+        result = simulate_night(rules, seed)
+        causes[result.cause] += 1
+        end_times.append(result.end_time)
+        for name, cams in result.occupancy.items():
+            occupancy.setdefault(name, Counter()).update(cams)
+    return causes, end_times, occupancy
+
+
+def simulate_nights(count, rules=None, seed=None, workers=None, chunk_size=SIM_CHUNK_SIZE):
+    """
+    Simulate many nights with NightSimulation, optionally over a process pool.
+
+    Every night gets its own seed drawn from seed, so a report is reproducible
+    whatever the number of workers, and a night's trace is rebuilt on demand
+    by replaying its seed instead of being kept for every night.
+
+    Args:
+        count (int): Number of nights.
+        rules (NightRules): Rules of every night.
+        seed: Master seed (None: not reproducible).
+        workers (int): Worker processes; 1 runs in this process, None lets
+            ProcessPoolExecutor decide.
+        chunk_size (int): Nights per pool task.
+
+    Returns:
+        SimulationReport: Aggregate report; trace(i) returns night i's events.
+    """
+    rules = rules or NightRules()
+    _night_end_time(rules)
+    seeder = random.Random(seed)
+    seeds = [seeder.getrandbits(64) for _ in range(count)]
+    chunks = [seeds[i:i + chunk_size] for i in range(0, count, chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        partials = [_simulate_chunk(rules, chunk) for chunk in chunks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor  # keeps multiprocessing off the game's startup path
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_simulate_chunk, repeat(rules), chunks))
+
+    causes = Counter()
+    end_times = []
+    occupancy = {}
+    for chunk_causes, chunk_end_times, chunk_occupancy in partials:
+        causes.update(chunk_causes)
+        end_times.extend(chunk_end_times)
+        for name, cams in chunk_occupancy.items():
+            occupancy.setdefault(name, Counter()).update(cams)
+    return SimulationReport(
+        rules, causes, end_times,
+        {name: dict(cams) for name, cams in occupancy.items()},
+        lambda night: simulate_night(rules, seeds[night]).trace,
+    )
+
+
+def simulate_nights_numpy(count, rules=None, seed=None):
+    """
+    Simulate many nights at once as NumPy arrays.
+
+    Power drain is deterministic, so every night's latest possible end is
+    known up front; only the moves are random. All moves of all nights are
+    drawn as two (count, moves) arrays and the nights are resolved column by
+    column, which costs one vectorized pass per move instead of a Python
+    loop per night. Uses NumPy's generator, so results differ from
+    simulate_nights for the same seed but follow the same distribution.
+
+    Args:
+        count (int): Number of nights.
+        rules (NightRules): Rules of every night.
+        seed: Seed for numpy.random.default_rng (None: not reproducible).
+
+    Returns:
+        SimulationReport: Aggregate report; trace(i) rebuilds night i's events.
+    """
+    import numpy as np  # optional - simulate_nights covers the same ground without it
+
+    rules = rules or NightRules()
+    blackout, dawn = _night_end_time(rules)
+    horizon = min(blackout, dawn)
+    n_moves = int(horizon // rules.move_interval)
+    rng = np.random.default_rng(seed)
+    movers = rng.integers(len(ANIMATRONICS), size=(count, n_moves), dtype=np.uint8)
+    targets = rng.integers(len(CAMERAS), size=(count, n_moves), dtype=np.uint8)
+    move_times = rules.move_interval * np.arange(1, n_moves + 1)
+
+    # A move onto the attack camera ends the night at that move
+    end_times = np.full(count, horizon, dtype=float)
+    caught = np.zeros(count, dtype=bool)
+    if rules.attack_camera in CAMERAS and n_moves:
+        hits = targets == CAMERAS.index(rules.attack_camera)
+        caught = hits.any(axis=1)
+        end_times[caught] = move_times[hits.argmax(axis=1)[caught]]
+    ending = "dawn" if dawn < blackout else "blackout"
+
+    # Time-weighted camera occupancy, resolved move by move
+    cam_index = {cam: i for i, cam in enumerate(CAMERAS)}
+    unplaced = len(CAMERAS)
+    locations = np.array([[cam_index.get(START_LOCATIONS.get(name), unplaced)
+                           for name in ANIMATRONICS]] * count, dtype=np.int16)
+    seconds = np.zeros((len(ANIMATRONICS), unplaced + 1))   # last column: not placed yet
+    previous = 0.0
+    for k in range(n_moves + 1):
+        until = np.minimum(move_times[k], end_times) if k < n_moves else end_times
+        spent = np.clip(until - previous, 0.0, None)
+        for a in range(len(ANIMATRONICS)):
+            seconds[a] += np.bincount(locations[:, a], weights=spent, minlength=unplaced + 1)
+        if k < n_moves:
+            applied = move_times[k] <= end_times
+            for a in range(len(ANIMATRONICS)):
+                moved = applied & (movers[:, k] == a)
+                locations[moved, a] = targets[moved, k]
+            previous = move_times[k]
+
+    def trace(night):
+        events = []
+        for k in range(n_moves):
+            if move_times[k] > end_times[night]:
+                break
+            events.append(NightEvent(float(move_times[k]), "move",
+                                     ANIMATRONICS[movers[night, k]], CAMERAS[targets[night, k]]))
+        if caught[night]:
+            events.append(NightEvent(float(end_times[night]), "caught",
+                                     events[-1].animatronic, events[-1].camera))
+        else:
+            events.append(NightEvent(float(end_times[night]), ending, None, None))
+        return events
+
+    n_caught = int(caught.sum())
+    causes = Counter({"caught": n_caught, ending: count - n_caught})
+    occupancy = {name: {cam: float(seconds[a, c]) for c, cam in enumerate(CAMERAS) if seconds[a, c]}
+                 for a, name in enumerate(ANIMATRONICS)}
+    return SimulationReport(rules, +causes, end_times.tolist(), occupancy, trace)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate FNAF AI nights for balancing.")
+    parser.add_argument("nights", type=int, nargs="?", default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--move-interval", type=float, default=8.0)
+    parser.add_argument("--drain", type=float, default=1)
+    parser.add_argument("--night-length", type=float, default=None)
+    parser.add_argument("--attack-camera", default=None)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="simulate over a process pool instead of NumPy")
+    parser.add_argument("--trace", type=int, default=None, metavar="NIGHT",
+                        help="also print the event trace of one night")
+    args = parser.parse_args()
+
+    rules = NightRules(move_interval=args.move_interval, drain=args.drain,
+                       night_length=args.night_length, attack_camera=args.attack_camera)
+    if args.workers is None and find_spec("numpy") is not None:
+        report = simulate_nights_numpy(args.nights, rules, args.seed)
+    else:
+        report = simulate_nights(args.nights, rules, args.seed, args.workers)
+
+    summary = report.summary()
+    print(f"🌙 {summary['nights']} nights | survival {summary['survival_rate']:.1%} | "
+          f"endings {summary['causes']}")
+    print(f"   night length: mean {summary['mean_end_time']:.1f}s, "
+          f"p5 {summary['p05_end_time']:.1f}s, median {summary['p50_end_time']:.1f}s")
+    print("   camera occupancy:")
+    for name, cams in summary["occupancy"].items():
+        print(f"     {name:<7}" + "  ".join(f"{cam} {share:5.1%}" for cam, share in cams.items()))
+    if args.trace is not None:
+        print(f"   night {args.trace}:")
+        for event in report.trace(args.trace):
+            who = f" {event.animatronic} -> {event.camera}" if event.animatronic else ""
+            print(f"     {event.time:7.1f}s  {event.kind}{who}")
@@ -0,0 +1,279 @@
+"""
+FNAF AI Night - Multi-Session Server
+====================================
+Hosts many concurrent players of FNAF AI Night on one asyncio process.
+Players connect over TCP and send one command per line; every session has
+its own night, power and camera state, while all sessions share one AI
+backend (fnaf_ai_game.ai_response with its pooled client and reply cache).
+Replies are shared between players, so the server asks statelessly: the
+animatronics keep no conversation memory across its requests.
+
+Identical prompts that are in flight at the same time are coalesced into a
+single backend call. Game time is evaluated lazily when a player sends a
+line, so idle connections cost only their socket - no per-session timers.
+
+Usage:
+    python fnaf_server.py          # listens on 127.0.0.1:7777
+    nc 127.0.0.1 7777              # connect as a player
+
+Environment variables:
+    FNAF_SERVER_HOST=127.0.0.1   – interface to listen on
+    FNAF_SERVER_PORT=7777        – TCP port
+
+Commands (one per line):
+    cam <1-5>   – switch camera        look   – show the current camera
+    status      – night, power, latency    quit   – leave
+    anything else is said to the animatronic on the current camera
+"""
+
+import asyncio
+import functools
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import fnaf_ai_game as game
+from fnaf_night_sim import CAMERAS, NightSimulation
+
+# Longest accepted command line, in bytes
+MAX_LINE_BYTES = 1024
+
+
+class PromptCoalescer:
+    """
+    Share one backend call between identical prompts in flight together.
+
+    Blocking responder calls run on a thread pool; a second request for the
+    same (animatronic, normalized prompt) awaits the first one's result.
+
+    Args:
+        responder (callable): Function (animatronic, player_input) -> str.
+        max_workers (int): Threads available for backend calls.
+    """
+
+    def __init__(self, responder, max_workers=16):
+        self.responder = responder
+        self.calls = 0
+        self.coalesced = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="fnaf-server-ai")
+        self._in_flight = {}
+
+    async def ask(self, animatronic, player_input):
+        """Return the reply, joining an identical in-flight request if any."""
+        key = game.ResponseCache.make_key(animatronic, player_input)
+        future = self._in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self.responder,
+                                          animatronic, player_input)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        # Shield so one player disconnecting does not cancel the shared call
+        return await asyncio.shield(future)
+
+    def shutdown(self):
+        """Stop the backend threads without waiting for in-flight calls."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Session:
+    """
+    State of one connected player.
+
+    The night runs on the same NightSimulation as run_pygame_game; it is
+    only stepped to the current time by advance().
+
+    Args:
+        session_id (int): Server-assigned id.
+        rng (random.Random): Random source for animatronic moves.
+    """
+
+    def __init__(self, session_id, rng=None):
+        self.id = session_id
+        self.night = 1
+        self.camera = CAMERAS[0]
+        # Running latency aggregates: constant memory however long the session runs
+        self.requests = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_last = None
+        self.rng = rng or random.Random()
+        self.night_sim = NightSimulation(rng=self.rng)
+        self.locations = self.night_sim.locations
+        self._stepped_at = time.monotonic()
+
+    @property
+    def power(self):
+        """Remaining power in percent, as of the last advance()."""
+        return self.night_sim.power
+
+    def advance(self):
+        """
+        Apply the animatronic moves that came due since the last call.
+
+        Returns:
+            list: Alert lines for the moves, oldest first.
+        """
+        now = time.monotonic()
+        events = self.night_sim.step(now - self._stepped_at)
+        self._stepped_at = now
+        return [f"[!] {event.animatronic} moved to {event.camera}!"
+                for event in events if event.kind == "move"]
+
+    def present(self):
+        """Animatronics on the current camera."""
+        return [name for name, cam in self.locations.items() if cam == self.camera]
+
+    def record_latency(self, seconds):
+        """Add one AI reply latency to the session's aggregates."""
+        self.requests += 1
+        self._latency_total += seconds
+        self._latency_max = max(self._latency_max, seconds)
+        self._latency_last = seconds
+
+    def latency_summary(self):
+        """Count, mean, max and last AI reply latency in milliseconds."""
+        if not self.requests:
+            return {"requests": 0, "mean_ms": None, "max_ms": None, "last_ms": None}
+        return {
+            "requests": self.requests,
+            "mean_ms": 1000 * self._latency_total / self.requests,
+            "max_ms": 1000 * self._latency_max,
+            "last_ms": 1000 * self._latency_last,
+        }
+
+
+class GameServer:
+    """
+    Asyncio line-protocol server running independent FNAF sessions.
+
+    Args:
+        responder (callable): Shared AI backend, default fnaf_ai_game.ai_response
+            with stateless_memory; pass a local stub for testing.
+        max_workers (int): Threads available for backend calls.
+    """
+
+    def __init__(self, responder=None, max_workers=16):
+        if responder is None:
+            responder = functools.partial(game.ai_response, memory=game.stateless_memory)
+        self.backend = PromptCoalescer(responder, max_workers)
+        self.sessions = {}
+        self._ids = itertools.count(1)
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=7777):
+        """Start listening; returns the asyncio.Server (port 0 picks a free port)."""
+        self._server = await asyncio.start_server(self._handle_client, host, port,
+                                                  limit=MAX_LINE_BYTES)
+        return self._server
+
+    async def stop(self):
+        """Stop accepting players and shut down the backend threads."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.backend.shutdown()
+
+    def stats(self):
+        """
+        Server-wide metrics.
+
+        Returns:
+            dict: connected sessions, backend calls, coalesced requests and
+            the latency summary of every session.
+        """
+        return {
+            "sessions": len(self.sessions),
+            "backend_calls": self.backend.calls,
+            "coalesced": self.backend.coalesced,
+            "latency": {sid: s.latency_summary() for sid, s in self.sessions.items()},
+        }
+
+    async def _handle_client(self, reader, writer):
+        session = Session(next(self._ids))
+        self.sessions[session.id] = session
+
+        def send(line):
+            writer.write((line + "\n").encode("utf-8"))
+
+        send(f"🎮 FNAF AI Night - session {session.id}. Commands: cam <1-5>, look, status, quit")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                for alert in session.advance():
+                    send(alert)
+                if session.power == 0:
+                    send("[BLACKOUT] Power is out! Game over!")
+                    break
+                if await self._handle_command(session, line.decode("utf-8", "replace").strip(), send):
+                    break
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass  # client went away, or sent an over-long line
+        finally:
+            self.sessions.pop(session.id, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_command(self, session, text, send):
+        """Run one player command; returns True when the session should end."""
+        command = text.lower()
+        if not text:
+            return False
+        if command in ("quit", "exit"):
+            send("🚪 Exiting game... You survived!")
+            return True
+        if command.startswith("cam "):
+            cam = f"CAM {command[4:].strip()}"
+            if cam in CAMERAS:
+                session.camera = cam
+                send(f"Switched to {cam}")
+            else:
+                send(f"Unknown camera. Choose 1-{len(CAMERAS)}.")
+        elif command == "look":
+            present = session.present()
+            send(f"{session.camera}: " + (", ".join(f"👁  {name}" for name in present) or "[ empty ]"))
+        elif command == "status":
+            latency = session.latency_summary()
+            mean = f"{latency['mean_ms']:.0f} ms" if latency["requests"] else "n/a"
+            send(f"Night {session.night} | Power {session.power}% | {session.camera} | "
+                 f"AI replies {latency['requests']}, mean latency {mean}")
+        else:
+            present = session.present()
+            animatronic = present[0] if present else session.rng.choice(game.animatronics)
+            started = time.perf_counter()
+            reply = await self.backend.ask(animatronic, text)
+            session.record_latency(time.perf_counter() - started)
+            send(f"{animatronic}: {reply}")
+        return False
+
+
+async def serve(host="127.0.0.1", port=7777, responder=None):
+    """Run a GameServer until cancelled."""
+    server = GameServer(responder)
+    listener = await server.start(host, port)
+    print(f"🎮 FNAF AI Night server listening on {host}:{listener.sockets[0].getsockname()[1]}")
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    game.validate_api_key()
+    try:
+        asyncio.run(serve(os.environ.get("FNAF_SERVER_HOST", "127.0.0.1"),
+                          int(os.environ.get("FNAF_SERVER_PORT", "7777"))))
+    except KeyboardInterrupt:
+        print("\n🚪 Server stopped.")
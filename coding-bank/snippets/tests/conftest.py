@@ -0,0 +1,141 @@
+"""
+Shared pytest setup for the snippet tests.
+
+The snippets import each other as top-level modules, so the snippets
+directory goes on sys.path. pygame runs on SDL's dummy drivers so the
+game loop can be tested without a display or sound card.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+class FakeChatBackend:
+    """
+    Scripted stand-in for the chat-completions endpoint on localhost.
+
+    Attributes:
+        statuses (list): Status codes for the next requests (200 afterwards).
+        delay (float): Seconds to wait before answering.
+        reply (str): Content of non-streamed replies; "{n}" is replaced by
+            the request's number, counting from 1.
+        pieces (list): Content pieces of streamed replies.
+        piece_delay (float): Seconds between streamed pieces.
+        requests (list): JSON bodies of the requests received, oldest first.
+        url (str): Base URL to point the OpenAI client at.
+    """
+
+    def __init__(self):
+        self.statuses = []
+        self.delay = 0.0
+        self.reply = " full reply "
+        self.pieces = [" Hello", " there,", " friend..."]
+        self.piece_delay = 0.0
+        self.requests = []
+        self.url = None
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self):
+        return len(self.requests)
+
+    def _next_status(self, body):
+        with self._lock:
+            self.requests.append(body)
+            return self.statuses.pop(0) if self.statuses else 200
+
+    def handler(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, payload, content_type="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                status = backend._next_status(body)
+                time.sleep(backend.delay)
+                if status != 200:
+                    error = {"error": {"message": "scripted failure", "type": "test"}}
+                    self._send(status, json.dumps(error).encode())
+                elif body.get("stream"):
+                    self._stream()
+                else:
+                    completion = {
+                        "id": "test", "object": "chat.completion", "created": 0, "model": "test",
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant",
+                                                 "content": backend.reply.replace("{n}", str(backend.calls))}}],
+                    }
+                    self._send(200, json.dumps(completion).encode())
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                for piece in backend.pieces:
+                    time.sleep(backend.piece_delay)
+                    chunk = {
+                        "id": "test", "object": "chat.completion.chunk", "created": 0, "model": "test",
+                        "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+
+        return Handler
+
+
+@pytest.fixture
+def pygame():
+    """The pygame module; skips the test when pygame is not installed."""
+    return pytest.importorskip("pygame")
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    """
+    Point fnaf_ai_game at a FakeChatBackend with a fresh client and caches.
+
+    Yields:
+        FakeChatBackend: The running backend, to script and inspect.
+    """
+    pytest.importorskip("openai")
+    import fnaf_ai_game as game
+
+    backend = FakeChatBackend()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), backend.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    backend.url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", backend.url)
+    monkeypatch.setenv("FNAF_AI_RPM", "6000")
+    monkeypatch.setattr(game, "_ai_client", None)
+    monkeypatch.setattr(game, "_ai_client_built", False)
+    monkeypatch.setattr(game, "response_cache", game.ResponseCache())
+    monkeypatch.setattr(game, "conversation_memory", game.ConversationMemory())
+    monkeypatch.setattr(game, "stream_stats", game.StreamStats())
+    try:
+        yield backend
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,19 @@
+"""Tests for utils.array_utils."""
+
+import random
+
+from utils.array_utils import RecordFile, intersection
+
+
+def test_intersection_of_record_files_larger_than_the_key_budget(tmp_path):
+    rng = random.Random(7)
+    left = [rng.randrange(5000) for _ in range(4000)]
+    right = [rng.randrange(5000) for _ in range(6000)]
+    RecordFile.write(str(tmp_path / "left.bin"), "<q", left)
+    RecordFile.write(str(tmp_path / "right.bin"), "<q", right)
+    with RecordFile(str(tmp_path / "left.bin"), "<q") as a, \
+            RecordFile(str(tmp_path / "right.bin"), "<q") as b:
+        expected = set(left) & set(right)
+        assert sorted(intersection(a, b, max_keys=100)) == sorted(expected)
+        assert sorted(intersection(a, b)) == sorted(expected)
+        assert sorted(intersection(a, right[:50], max_keys=100)) == sorted(set(left) & set(right[:50]))
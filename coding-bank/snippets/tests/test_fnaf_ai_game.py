@@ -0,0 +1,545 @@
+"""Tests for fnaf_ai_game."""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import fnaf_ai_game as game
+
+
+class FrameClock(game.FrameProfiler):
+    """FrameProfiler that also remembers when every frame started."""
+
+    def __init__(self):
+        super().__init__(target_fps=game.ACTIVE_FPS)
+        self.frame_starts = []
+
+    def begin_frame(self):
+        self.frame_starts.append(time.monotonic())
+        super().begin_frame()
+
+
+def _post_keys(pygame, text):
+    for ch in text:
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=ord(ch), unicode=ch, mod=0))
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r", mod=0))
+
+
+def test_loop_keeps_rendering_while_reply_is_pending(pygame, monkeypatch):
+    reply_delay = 0.5
+    calls = []
+    shown = []
+
+    def slow_responder(animatronic, player_input):
+        started = time.monotonic()
+        time.sleep(reply_delay)
+        calls.append((started, time.monotonic(), player_input))
+        return f"echo {player_input}"
+
+    draw_message_log = game._draw_message_log
+
+    def spy_message_log(surface, messages, font):
+        shown.extend(messages)
+        draw_message_log(surface, messages, font)
+
+    monkeypatch.setattr(game, "_draw_message_log", spy_message_log)
+    profiler = FrameClock()
+
+    def player():
+        time.sleep(0.3)  # let the window open
+        _post_keys(pygame, "hi")
+        deadline = time.monotonic() + 5
+        while not calls and time.monotonic() < deadline:
+            time.sleep(0.05)
+        time.sleep(0.3)  # a few frames to show the finished reply
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    thread = threading.Thread(target=player, daemon=True)
+    thread.start()
+    game.run_pygame_game(responder=slow_responder, profiler=profiler)
+    thread.join()
+
+    assert len(calls) == 1
+    started, finished, player_input = calls[0]
+    assert player_input == "hi"
+    frames_while_pending = [t for t in profiler.frame_starts if started <= t <= finished]
+    # At ACTIVE_FPS a blocked loop would manage at most one frame in this window
+    assert len(frames_while_pending) >= reply_delay * game.ACTIVE_FPS / 3
+    assert any(line.endswith("echo hi") for line in shown)
+
+
+def test_stream_yields_pieces_as_they_arrive(fake_openai):
+    fake_openai.piece_delay = 0.2
+    started = time.monotonic()
+    arrivals = [(piece, time.monotonic() - started)
+                for piece in game.ai_response_stream("Freddy", "hi")]
+
+    assert "".join(piece for piece, _ in arrivals).strip() == "Hello there, friend..."
+    assert len(arrivals) == 3
+    # The first piece is shown long before the reply is complete
+    assert arrivals[-1][1] - arrivals[0][1] >= 0.3
+    assert fake_openai.requests[0]["stream"] is True
+    assert game.stream_stats.requests == 1
+    assert game.stream_stats.last_ttft < game.stream_stats.last_total - 0.3
+
+
+def test_ai_worker_exposes_partial_stream_text(fake_openai):
+    fake_openai.piece_delay = 0.2
+    worker = game.AIWorker()
+    try:
+        reply = worker.submit("Chica", "hi")
+        deadline = time.monotonic() + 5
+        while not reply.text and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert reply.text and not reply.done()
+        assert reply.result() == "Hello there, friend..."
+    finally:
+        worker.shutdown()
+
+
+def _install_ai_client(monkeypatch, backend, **options):
+    """Make ai_response use an AIClient with options, talking to backend."""
+    import openai
+
+    client = game.AIClient(openai.OpenAI(api_key="sk-test", base_url=backend.url, max_retries=0),
+                           **options)
+    monkeypatch.setattr(game, "_ai_client", client)
+    monkeypatch.setattr(game, "_ai_client_built", True)
+    return client
+
+
+def test_ai_client_retries_rate_limits_and_server_errors(fake_openai, monkeypatch):
+    _install_ai_client(monkeypatch, fake_openai, base_delay=0.01, max_delay=0.05)
+    fake_openai.statuses = [429, 503]
+    assert game.ai_response("Freddy", "hi") == "full reply"
+    assert fake_openai.calls == 3
+
+
+def test_ai_client_does_not_retry_client_errors(fake_openai, monkeypatch):
+    client = _install_ai_client(monkeypatch, fake_openai, base_delay=0.01)
+    fake_openai.statuses = [400]
+    assert game.ai_response("Freddy", "hi").startswith("[ERROR:")
+    assert fake_openai.calls == 1
+    assert client.breaker.state == "closed"
+
+
+def test_circuit_opens_after_backend_failures(fake_openai, monkeypatch):
+    breaker = game.CircuitBreaker(failure_threshold=2, reset_seconds=0.3)
+    _install_ai_client(monkeypatch, fake_openai, max_retries=0, breaker=breaker)
+    fake_openai.statuses = [500, 500]
+    for _ in range(2):
+        assert game.ai_response("Freddy", "hi").startswith("[ERROR:")
+    assert breaker.state == "open"
+    # While open, requests are refused without reaching the backend
+    assert game.ai_response("Freddy", "hi") == game._demo_reply("Freddy")
+    assert fake_openai.calls == 2
+
+    time.sleep(0.3)
+    assert game.ai_response("Freddy", "hi") == "full reply"
+    assert breaker.state == "closed"
+
+
+def test_ai_client_deadline_covers_slow_backend(fake_openai, monkeypatch):
+    _install_ai_client(monkeypatch, fake_openai, max_retries=0, deadline=0.3)
+    fake_openai.delay = 1.0
+    started = time.monotonic()
+    assert game.ai_response("Freddy", "hi").startswith("[ERROR:")
+    assert time.monotonic() - started < 0.9
+
+
+def test_local_congestion_does_not_open_circuit(fake_openai, monkeypatch):
+    client = _install_ai_client(monkeypatch, fake_openai, requests_per_minute=6, burst=1,
+                                deadline=0.2)
+    request = {"model": "test", "messages": [{"role": "user", "content": "hi"}]}
+    client.create(**request)
+    for _ in range(client.breaker.failure_threshold + 1):
+        with pytest.raises(TimeoutError):
+            client.create(**request)
+    assert client.breaker.state == "closed"
+    assert fake_openai.calls == 1
+
+
+def test_local_congestion_ends_half_open_trial(fake_openai, monkeypatch):
+    breaker = game.CircuitBreaker(failure_threshold=1, reset_seconds=0.1)
+    client = _install_ai_client(monkeypatch, fake_openai, requests_per_minute=6, burst=1,
+                                deadline=0.2, max_retries=0, breaker=breaker)
+    request = {"model": "test", "messages": [{"role": "user", "content": "hi"}]}
+    fake_openai.statuses = [500]
+    with pytest.raises(Exception):
+        client.create(**request)
+    time.sleep(0.1)
+    assert breaker.state == "half-open"
+    # The trial request is stopped by the empty token bucket, not the backend
+    with pytest.raises(TimeoutError):
+        client.create(**request)
+    assert breaker.allow()
+
+
+def test_audio_manager_sets_up_its_channels_before_playing_sounds(pygame):
+    pygame.mixer.init()
+    pygame.mixer.set_num_channels(8)
+    try:
+        manager = game.AudioManager(channels=12)
+        sound = pygame.mixer.Sound(buffer=b"\x00\x40" * 44100)
+        # Straight to play_sound, as ToneBank does, without a file played first
+        assert all(manager.play_sound(sound, name=f"cue {i}") for i in range(12))
+        assert pygame.mixer.get_num_channels() == 12
+        assert manager.counts["played"] == 12
+    finally:
+        pygame.mixer.quit()
+
+
+@pytest.mark.parametrize("mode", ["demo", "text"])
+def test_startup_within_budget(mode):
+    assert game.check_startup_budget({mode: game.STARTUP_BUDGETS[mode]})
+
+
+def test_import_leaves_optional_backends_unloaded():
+    check = ("import sys, fnaf_ai_game; "
+             "print(sorted(m for m in ('openai', 'pygame', 'numpy') if m in sys.modules))")
+    child = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True,
+                           cwd=os.path.dirname(game.__file__), check=True)
+    assert child.stdout.strip() == "[]"
+
+
+def _write_transcript(path, count):
+    writer = game.TranscriptWriter(str(path), flush_interval=0.01)
+    for seq in range(count):
+        writer.write(seq, f"line {seq}")
+    writer.close()
+
+
+def test_transcript_archive_pages_a_finished_night(tmp_path):
+    _write_transcript(tmp_path / f"night-a{game.TranscriptArchive.SUFFIX}", 120)
+    archive = game.TranscriptArchive(str(tmp_path))
+    assert archive.nights() == ["night-a"]
+    assert [line.text for line in archive.page("night-a", 2, 50)] == \
+        [f"line {seq}" for seq in range(100, 120)]
+    assert [line.seq for line in archive.load("night-a")] == list(range(120))
+
+
+def test_transcript_archive_reads_a_night_that_was_never_closed(tmp_path):
+    import gzip
+    import json
+
+    # A copy taken while the writer is running: flushed, but no end-of-stream marker
+    path = tmp_path / f"night-live{game.TranscriptArchive.SUFFIX}"
+    live = gzip.open(path, "at", encoding="utf-8")
+    for seq in range(30):
+        live.write(json.dumps({"seq": seq, "time": 0.0, "text": f"line {seq}"}) + "\n")
+    live.flush()
+    (tmp_path / f"night-crash{game.TranscriptArchive.SUFFIX}").write_bytes(path.read_bytes())
+    live.close()
+    # A crash mid-write: the file ends inside a compressed block
+    truncated = path.read_bytes()[:-12]
+    (tmp_path / f"night-cut{game.TranscriptArchive.SUFFIX}").write_bytes(truncated)
+
+    archive = game.TranscriptArchive(str(tmp_path))
+    assert [line.seq for line in archive.page("night-crash", 0, 100)] == list(range(30))
+    cut = archive.load("night-cut")
+    assert [line.seq for line in cut] == list(range(len(cut)))
+
+
+def test_conversation_memory_keeps_prompts_within_budget(fake_openai):
+    memory = game.ConversationMemory(token_budget=200)
+    for turn in range(40):
+        game.ai_response("Freddy", f"message {turn} " + "where are you " * (turn % 7), memory=memory)
+    system_prompts = {request["messages"][0]["content"] for request in fake_openai.requests}
+    assert len(system_prompts) == 1
+    last = fake_openai.requests[-1]["messages"]
+    assert last[1]["role"] == "system" and last[1]["content"].startswith("Earlier tonight")
+    assert last[-1]["content"].startswith("message 39")
+    assert memory.stats()["max_tokens"] <= 200
+
+
+def test_repeated_prompts_are_answered_in_context(fake_openai):
+    fake_openai.reply = "reply {n}"
+    for turn in range(6):
+        assert game.ai_response("Freddy", "hello") == f"reply {turn + 1}"
+    # Only the opener could come from the cache; every later "hello" has history
+    assert fake_openai.calls == 6
+    assert len(fake_openai.requests[-1]["messages"]) == 2 + 2 * 5
+
+
+def test_replayed_conversations_are_answered_from_the_cache(fake_openai):
+    fake_openai.reply = "reply {n}"
+    variants = game.response_cache.variants
+    for _ in range(40):
+        game.conversation_memory.reset()   # what every new night does
+        opener = game.ai_response("Freddy", "hello")
+        second = game.ai_response("Freddy", "Who are you?")
+        # A reply written for another conversation state is never served
+        source = fake_openai.requests[int(second.split()[-1]) - 1]["messages"]
+        assert {"role": "assistant", "content": opener} in source
+    # Openers settle on a few variants, so second turns repeat and hit too
+    assert fake_openai.calls <= variants + variants * variants
+    assert game.response_cache.stats()["hits"] >= 40
+
+
+def test_stateless_memory_uses_the_response_cache(fake_openai):
+    fake_openai.reply = "reply {n}"
+    for _ in range(6):
+        game.ai_response("Freddy", "hello", memory=game.stateless_memory)
+    assert fake_openai.calls == game.response_cache.variants
+    assert all(len(request["messages"]) == 2 for request in fake_openai.requests)
+
+
+def _mixer_only(monkeypatch):
+    """Make AudioManager play files through pygame.mixer even if playsound is installed."""
+    available = game.backend_available
+    monkeypatch.setattr(game, "backend_available",
+                        lambda name: name != "playsound" and available(name))
+
+
+def test_audio_manager_drops_files_it_cannot_decode(pygame, monkeypatch, tmp_path):
+    _mixer_only(monkeypatch)
+    bad = tmp_path / "bad.wav"
+    bad.write_bytes(b"not audio")
+    events = []
+    pygame.mixer.init()
+    try:
+        manager = game.AudioManager(on_event=lambda event, name, info: events.append((event, name, info)))
+        assert manager.play_file(str(bad)) is False
+        assert manager.preload(str(bad)) is False
+        assert events[0][:2] == ("dropped", str(bad))
+        assert events[0][2]["reason"].startswith("cannot decode")
+        assert manager.counts["dropped"] == 2
+    finally:
+        pygame.mixer.quit()
+
+
+def test_audio_event_hook_may_play_sounds(pygame):
+    pygame.mixer.init()
+    try:
+        sound = pygame.mixer.Sound(buffer=b"\x00\x40" * 44100)
+        hooked = []
+
+        def replay_on_drop(event, name, info):
+            hooked.append(event)
+            if name != "retry":
+                manager.play_sound(sound, name="retry")
+
+        manager = game.AudioManager(channels=1, on_event=replay_on_drop)
+        assert manager.play_sound(sound, priority=1, name="first")
+        result = []
+        thread = threading.Thread(target=lambda: result.append(manager.play_sound(sound, name="second")),
+                                  daemon=True)
+        thread.start()
+        thread.join(2)
+        assert result == [False], "hook deadlocked on the AudioManager lock"
+        assert hooked == ["dropped", "dropped"]
+    finally:
+        pygame.mixer.quit()
+
+
+def test_audio_manager_prefers_playsound_for_files(monkeypatch, tmp_path):
+    played = []
+    path = tmp_path / "cue.wav"
+    path.write_bytes(b"")
+    monkeypatch.setattr(game, "backend_available", lambda name: True)
+    monkeypatch.setattr(game, "playsound", played.append)
+    manager = game.AudioManager()
+    assert manager.play_file(str(path), block=True)
+    assert played == [str(path)]
+
+
+def test_text_cache_reuses_surfaces_and_evicts_least_recent(pygame):
+    pygame.font.init()
+    font = pygame.font.Font(None, 18)
+    cache = game.TextCache(max_entries=2)
+    first = cache.render(font, "CAM 1", game._WHITE)
+    assert cache.render(font, "CAM 1", game._WHITE) is first
+    cache.render(font, "CAM 2", game._WHITE)
+    cache.render(font, "CAM 1", game._WHITE)   # CAM 1 is now the most recent
+    cache.render(font, "CAM 3", game._WHITE)   # evicts CAM 2
+    assert (cache.hits, cache.misses) == (2, 3)
+    assert cache.render(font, "CAM 1", game._WHITE) is first
+    cache.render(font, "CAM 2", game._WHITE)
+    assert cache.misses == 4
+
+
+def test_retained_hud_matches_full_redraw_and_reports_only_changed_regions(pygame):
+    import random
+
+    pygame.init()
+    try:
+        width, height = 800, 600
+        screen = pygame.display.set_mode((width, height))
+        fonts = (pygame.font.SysFont("monospace", 18), pygame.font.SysFont("monospace", 15),
+                 pygame.font.SysFont("monospace", 28, bold=True))
+        cameras = list(game.CAMERAS)
+        hud = game._build_hud(width, height, cameras, *fonts)
+        rng = random.Random(42)
+        state = {"power": 100, "cam": "CAM 1", "text": "", "overlay": (),
+                 "locations": {"Freddy": "CAM 1", "Bonnie": "CAM 2", "Chica": "CAM 3"},
+                 "messages": ("[System] FNAF AI Night started. Type to interact!",)}
+
+        def inputs():
+            return {
+                "title": (1, state["power"]),
+                "buttons": (state["cam"],),
+                "camera": (state["cam"], tuple(state["locations"].items())),
+                "power": (state["power"],),
+                "log": (state["messages"][-3:],),
+                "input": (state["text"],),
+                "profiler": (state["overlay"],),
+            }
+
+        hud.render(screen, inputs())
+        for _ in range(200):
+            change = rng.randrange(7)
+            if change == 0:
+                state["power"] = max(0, state["power"] - 1)
+            elif change == 1:
+                state["cam"] = rng.choice(cameras)
+            elif change == 2:
+                state["locations"][rng.choice(list(state["locations"]))] = rng.choice(cameras)
+            elif change == 3:
+                state["messages"] += ("x" * rng.randint(1, 100),)
+            elif change == 4:
+                state["text"] = (state["text"] + "a")[-60:] if rng.random() < 0.8 else state["text"][:-1]
+            elif change == 5:
+                state["overlay"] = () if state["overlay"] else (f"frame {rng.random():.3f}",)
+            before = screen.copy()
+            dirty = hud.render(screen, inputs())
+            pygame.display.update(dirty)
+
+            # A fresh layer always draws the whole frame
+            reference = pygame.Surface((width, height))
+            game._build_hud(width, height, cameras, *fonts).render(reference, inputs())
+            assert pygame.image.tobytes(screen, "RGB") == pygame.image.tobytes(reference, "RGB")
+
+            # Pixels outside the dirty rects are the previous frame's
+            for rect in dirty:
+                before.blit(screen, rect, rect)
+            assert pygame.image.tobytes(before, "RGB") == pygame.image.tobytes(screen, "RGB")
+            if change == 6:
+                assert dirty == []
+            assert all(rect != screen.get_rect() for rect in dirty)
+    finally:
+        pygame.quit()
+
+
+def test_frame_profiler_aggregates_fake_sections(monkeypatch, tmp_path):
+    import csv
+    import json
+
+    now = [100.0]
+    monkeypatch.setattr(game.time, "perf_counter", lambda: now[0])
+
+    def spend(ms):
+        now[0] += ms / 1000
+
+    profiler = game.FrameProfiler(target_fps=30, trace=True)
+    for frame in range(10):
+        profiler.begin_frame()
+        spend(2)
+        profiler.lap("events")
+        spend(40 if frame == 7 else 3)
+        profiler.lap("draw")
+        if frame % 2 == 0:
+            profiler.add("widget", 0.001)
+        spend(50)
+        profiler.lap("idle")
+    profiler.end_frame()
+
+    stats = profiler.stats()
+    phases = stats["phases"]
+    # Only frame 7's work overruns 33 ms; 50 ms of idle waiting is not a drop
+    assert (stats["frames"], stats["dropped"]) == (10, 1)
+    assert sorted(phases) == ["draw", "events", "frame", "idle", "widget", "work"]
+    assert phases["events"]["count"] == 10
+    assert phases["events"]["mean"] == pytest.approx(2)
+    assert phases["draw"]["mean"] == pytest.approx(6.7)
+    assert phases["draw"]["p50"] == pytest.approx(3)
+    assert phases["draw"]["max"] == pytest.approx(40)
+    assert phases["widget"]["count"] == 5
+    assert phases["widget"]["mean"] == pytest.approx(1)
+    assert phases["work"]["max"] == pytest.approx(42)
+    assert phases["frame"]["mean"] == pytest.approx(58.7)
+    assert stats["fps"] == pytest.approx(1000 / 58.7)
+
+    profiler.write_trace(str(tmp_path / "trace.json"))
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert trace["target_ms"] == pytest.approx(1000 / 30)
+    assert trace["summary"]["frames"] == 10
+    assert trace["summary"]["phases"]["draw"]["max"] == pytest.approx(40)
+    assert [frame["frame"] for frame in trace["frames"]] == list(range(1, 11))
+    assert [frame["start_s"] for frame in trace["frames"]] == \
+        pytest.approx([0.055 * i + 0.037 * (i > 7) for i in range(10)])
+    assert "widget" in trace["frames"][0]["phases_ms"]
+    assert "widget" not in trace["frames"][1]["phases_ms"]
+    assert trace["frames"][7]["phases_ms"]["work"] == pytest.approx(42)
+
+    profiler.write_trace(str(tmp_path / "trace.csv"))
+    with open(tmp_path / "trace.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10
+    assert float(rows[1]["widget_ms"]) == 0.0
+    assert float(rows[7]["draw_ms"]) == pytest.approx(40)
+
+
+def test_transcript_writer_reports_a_failed_writer_thread(tmp_path, capsys):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    writer = game.TranscriptWriter(str(blocker / "night.jsonl.gz"), flush_interval=0.01)
+    writer._thread.join(5)
+    assert isinstance(writer.error, OSError)
+    with pytest.raises(OSError):
+        writer.write(0, "lost")
+    with pytest.raises(OSError):
+        writer.close()
+
+    # The message log keeps going without its transcript
+    writer = game.TranscriptWriter(str(blocker / "night.jsonl.gz"), flush_interval=0.01)
+    writer._thread.join(5)
+    messages = game.MessageLog(transcript=writer)
+    messages.append("still here")
+    messages.close()
+    assert messages.transcript is None
+    assert messages.tail(1) == ("still here",)
+    assert "Transcript disabled" in capsys.readouterr().out
+
+
+def test_idle_loop_sleeps_until_the_next_event_or_timer(pygame, monkeypatch):
+    wakes = []
+    wait_for_events = game._wait_for_events
+
+    def spy_wait(timeout):
+        asleep = time.monotonic()
+        events = wait_for_events(timeout)
+        wakes.append((time.monotonic(), timeout, [event.type for event in events], asleep))
+        return events
+
+    monkeypatch.setattr(game, "_wait_for_events", spy_wait)
+    fired = []
+
+    def player():
+        time.sleep(0.4)  # let the window open and go idle
+        pygame.time.set_timer(pygame.USEREVENT, 700, loops=1)
+        fired.append(time.monotonic() + 0.7)
+        time.sleep(2.0)
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    thread = threading.Thread(target=player, daemon=True)
+    thread.start()
+    started = time.monotonic()
+    game.run_pygame_game(responder=lambda animatronic, player_input: "boo", profiler=FrameClock())
+    elapsed = time.monotonic() - started
+    thread.join()
+
+    # Woken by the timer event, not by a frame tick or the next power drain
+    woken = [at for at, _, types, _ in wakes if pygame.USEREVENT in types]
+    assert len(woken) == 1
+    assert -0.02 <= woken[0] - fired[0] <= 0.15
+    # Otherwise it sleeps until the next drain (once a second), not ACTIVE_FPS times a second
+    assert all(0 < timeout <= 1.0 for _, timeout, _, _ in wakes)
+    assert len(wakes) <= 3 * elapsed + 3
+    assert len(wakes) < elapsed * game.ACTIVE_FPS / 4
+    timed_out = [(at - asleep, timeout) for at, timeout, types, asleep in wakes if not types]
+    assert timed_out, "the power-drain timer never woke the loop"
+    assert all(timeout - 0.02 <= slept <= timeout + 0.15 for slept, timeout in timed_out)
@@ -0,0 +1,51 @@
+"""Tests for fnaf_night_sim."""
+
+import pytest
+
+import fnaf_night_sim as sim
+
+RULES = sim.NightRules(night_length=90, attack_camera="CAM 5")
+
+
+def test_same_seed_gives_the_same_night():
+    first = sim.simulate_night(RULES, seed=11)
+    assert sim.simulate_night(RULES, seed=11) == first
+    assert sim.NightSimulation(RULES, seed=11).run() == first
+
+
+def test_process_pool_matches_in_process_run():
+    serial = sim.simulate_nights(200, RULES, seed=3, workers=1, chunk_size=50)
+    pooled = sim.simulate_nights(200, RULES, seed=3, workers=2, chunk_size=50)
+    assert pooled.causes == serial.causes
+    assert pooled.end_times == serial.end_times
+    assert pooled.occupancy.keys() == serial.occupancy.keys()
+    for name, cams in serial.occupancy.items():
+        assert pooled.occupancy[name] == pytest.approx(cams)
+    assert pooled.trace(17) == serial.trace(17)
+
+
+def test_numpy_is_seeded_and_agrees_with_the_process_pool():
+    pytest.importorskip("numpy")
+    nights = 4000
+    report = sim.simulate_nights_numpy(nights, RULES, seed=5)
+    again = sim.simulate_nights_numpy(nights, RULES, seed=5)
+    assert again.causes == report.causes
+    assert again.end_times == report.end_times
+
+    # Different generators, so the two paths agree in distribution only
+    pooled = sim.simulate_nights(nights, RULES, seed=5, workers=2)
+    assert report.nights == pooled.nights == nights
+    assert set(report.causes) <= {"caught", "dawn"}
+    assert set(pooled.causes) <= {"caught", "dawn"}
+    assert abs(report.survival_rate - pooled.survival_rate) < 0.04
+    numpy_share = report.occupancy_distribution()
+    pool_share = pooled.occupancy_distribution()
+    for name in sim.ANIMATRONICS:
+        for cam in sim.CAMERAS:
+            assert abs(numpy_share[name][cam] - pool_share[name][cam]) < 0.03
+
+    # A night's rebuilt trace ends the way the report counted it
+    for night in range(20):
+        trace = report.trace(night)
+        assert trace[-1].time == report.end_times[night]
+        assert trace[-1].kind in ("caught", "dawn")
@@ -0,0 +1,103 @@
+"""Tests for fnaf_server."""
+
+import asyncio
+import threading
+import time
+
+import fnaf_server as server
+
+
+def _serve(test, responder):
+    """Run test(game_server, port) against a GameServer on a free localhost port."""
+    async def main():
+        game_server = server.GameServer(responder)
+        listener = await game_server.start("127.0.0.1", 0)
+        try:
+            return await test(game_server, listener.sockets[0].getsockname()[1])
+        finally:
+            await game_server.stop()
+    return asyncio.run(main())
+
+
+async def _play(port, commands):
+    """Connect, send commands one by one and return the reply line to each."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await reader.readline()  # greeting
+    replies = []
+    for command in commands:
+        writer.write((command + "\n").encode())
+        await writer.drain()
+        replies.append((await reader.readline()).decode().strip())
+    writer.close()
+    return replies
+
+
+def test_identical_prompts_in_flight_share_one_backend_call():
+    calls = []
+    lock = threading.Lock()
+
+    def slow_responder(animatronic, player_input):
+        with lock:
+            calls.append(player_input)
+        time.sleep(0.3)
+        return f"echo {player_input}"
+
+    async def test(game_server, port):
+        players = [_play(port, ["cam 2", "Hello!"]) for _ in range(20)]
+        return await asyncio.gather(*players, _play(port, ["cam 2", "other"]))
+
+    results = _serve(test, slow_responder)
+    assert sorted(calls) == ["Hello!", "other"]
+    assert all(replies[1].endswith("echo Hello!") for replies in results[:-1])
+    assert results[-1][1].endswith("echo other")
+
+
+def test_sessions_keep_independent_state():
+    async def test(game_server, port):
+        first, second = await asyncio.gather(
+            _play(port, ["cam 3", "status"]),
+            _play(port, ["status"]),
+        )
+        return first, second, game_server.stats()
+
+    first, second, stats = _serve(test, lambda animatronic, player_input: "boo")
+    assert first[0] == "Switched to CAM 3"
+    assert "CAM 3" in first[1]
+    assert "CAM 1" in second[0]
+    assert stats["backend_calls"] == 0
+
+
+def test_idle_sessions_and_overlong_lines():
+    async def test(game_server, port):
+        connections = [await asyncio.open_connection("127.0.0.1", port) for _ in range(50)]
+        for reader, _ in connections:
+            await reader.readline()
+        sessions = game_server.stats()["sessions"]
+
+        reader, writer = connections[0]
+        writer.write(b"x" * (server.MAX_LINE_BYTES * 2) + b"\n")
+        await writer.drain()
+        closed = await asyncio.wait_for(reader.read(), timeout=5)
+
+        for _, writer in connections:
+            writer.close()
+        await asyncio.sleep(0.2)
+        return sessions, closed, game_server.stats()["sessions"]
+
+    sessions, closed, remaining = _serve(test, lambda animatronic, player_input: "boo")
+    assert sessions == 50
+    assert closed == b""
+    assert remaining == 0
+
+
+def test_session_latency_summary_uses_running_aggregates():
+    session = server.Session(1)
+    assert session.latency_summary()["requests"] == 0
+    for seconds in (0.2, 0.5, 0.1):
+        session.record_latency(seconds)
+    summary = session.latency_summary()
+    assert summary["requests"] == 3
+    assert abs(summary["mean_ms"] - 800 / 3) < 1e-6
+    assert abs(summary["max_ms"] - 500) < 1e-6
+    assert abs(summary["last_ms"] - 100) < 1e-6
+    assert not hasattr(session, "latencies")
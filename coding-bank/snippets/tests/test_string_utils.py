@@ -0,0 +1,28 @@
+"""Tests for utils.string_utils."""
+
+import random
+
+import pytest
+
+from utils.string_utils import AnagramIndex, anagram_signature, is_anagram
+
+
+@pytest.mark.parametrize("alphabet", ["abcdefghijklmnopqrstuvwxyz", "ab cd", "aéöñ"])
+@pytest.mark.parametrize("length", [0, 5, 63, 64, 300])
+def test_anagram_signature_matches_exactly_the_anagrams(alphabet, length):
+    rng = random.Random(length)
+    word = "".join(rng.choice(alphabet) for _ in range(length))
+    shuffled = "".join(rng.sample(word, len(word))).upper()
+    assert is_anagram(word, shuffled)
+    assert anagram_signature(word) == anagram_signature(shuffled)
+    if word:
+        changed = chr(ord(word[0]) ^ 1) + word[1:]
+        assert not is_anagram(word, changed)
+        assert anagram_signature(word) != anagram_signature(changed)
+
+
+def test_anagram_index_round_trips_through_json(tmp_path):
+    index = AnagramIndex(["listen", "silent", "enlist", "google"])
+    assert index.anagrams("tinsel") == ["listen", "silent", "enlist"]
+    index.save(str(tmp_path / "anagrams.json"))
+    assert AnagramIndex.load(str(tmp_path / "anagrams.json")).groups() == [["listen", "silent", "enlist"]]
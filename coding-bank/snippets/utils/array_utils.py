@@ -4,21 +4,49 @@ Array and List Utility Functions
 Common operations on arrays and lists.
 """
 
+import heapq
+import math
+import mmap
+import operator
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import chain, compress, count, islice, repeat
+
+# NumPy is optional - vectorized paths are only used when it is installed
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Largest smaller RecordFile input that intersection hashes in memory
+INTERSECTION_MAX_KEYS = 1_000_000
+
+
 def chunk_array(arr, size):
     """
     Split array into chunks of specified size
     
     Args:
-        arr: Input list
+        arr: Input list (or RecordFile)
         size: Size of each chunk
     
     Returns:
-        List of chunks
+        List of chunks; for a RecordFile, a generator of chunks read from
+        disk one at a time
     
     Example:
         >>> chunk_array([1, 2, 3, 4, 5, 6, 7], 3)
         [[1, 2, 3], [4, 5, 6], [7]]
     """
+    if isinstance(arr, RecordFile):
+        return arr.iter_chunks(size)
     return [arr[i:i + size] for i in range(0, len(arr), size)]
 
 
@@ -45,36 +73,77 @@ def flatten(nested_list):
     return result
 
 
-def unique(arr):
+def unique(arr, return_index=False, return_counts=False):
     """
     Get unique elements while preserving order
     
     Args:
-        arr: Input list
+        arr: Input list (or NumPy array, handled with vectorized ops)
+        return_index: Also return the index of each element's first occurrence
+        return_counts: Also return how often each element occurs
     
     Returns:
-        List with duplicates removed
+        List with duplicates removed, or a tuple (values, first_indices, counts)
+        containing the requested extras (like numpy.unique, but in first-seen
+        order). NumPy input gives NumPy arrays back.
     
     Example:
         >>> unique([1, 2, 2, 3, 4, 3, 5])
         [1, 2, 3, 4, 5]
+        >>> unique(['b', 'a', 'b', 'c', 'a'], return_index=True, return_counts=True)
+        (['b', 'a', 'c'], [0, 1, 3], [2, 2, 1])
     """
-    seen = set()
-    result = []
-    for item in arr:
-        if item not in seen:
-            seen.add(item)
-            result.append(item)
-    return result
+    if _is_numpy_array(arr):
+        return _unique_array(arr, return_index, return_counts)
+
+    if not (return_index or return_counts):
+        return list(dict.fromkeys(arr))
+
+    first_index = {}
+    counts = {}
+    for i, item in enumerate(arr):
+        if item in counts:
+            counts[item] += 1
+        else:
+            first_index[item] = i
+            counts[item] = 1
+    result = [list(counts)]
+    if return_index:
+        result.append(list(first_index.values()))
+    if return_counts:
+        result.append(list(counts.values()))
+    return tuple(result)
+
+
+def _unique_array(arr, return_index, return_counts):
+    """Order-preserving unique for NumPy arrays using one sort."""
+    values, first_index, counts = np.unique(arr, return_index=True, return_counts=True)
+    # np.unique sorts by value; reorder by first occurrence instead
+    order = np.argsort(first_index, kind='stable')
+    values = values[order]
+    if not (return_index or return_counts):
+        return values
+    result = [values]
+    if return_index:
+        result.append(first_index[order])
+    if return_counts:
+        result.append(counts[order])
+    return tuple(result)
 
 
-def intersection(arr1, arr2):
+def intersection(arr1, arr2, max_keys=INTERSECTION_MAX_KEYS):
     """
     Find common elements in two lists
     
+    With a RecordFile input, only the smaller input is hashed and the
+    larger one is streamed past it. If the smaller input has more than
+    max_keys records too, both are streamed through a GroupAggregator that
+    spills to disk, so memory stays bounded by max_keys distinct values.
+    
     Args:
-        arr1: First list
-        arr2: Second list
+        arr1: First list (or RecordFile)
+        arr2: Second list (or RecordFile)
+        max_keys: Most records of the smaller RecordFile input hashed in memory
     
     Returns:
         List of common elements
@@ -83,6 +152,19 @@ def intersection(arr1, arr2):
         >>> intersection([1, 2, 3, 4], [3, 4, 5, 6])
         [3, 4]
     """
+    if isinstance(arr1, RecordFile) or isinstance(arr2, RecordFile):
+        small, large = (arr1, arr2) if len(arr1) <= len(arr2) else (arr2, arr1)
+        if len(small) <= max_keys:
+            # Hash only the smaller input and stream the larger one past it
+            lookup = set(small)
+            return list({item for item in large if item in lookup})
+        # Mark each value with the inputs it occurs in (bit 1: small, bit 2: large)
+        sides = Reducer(_zero, operator.or_, operator.or_)
+        tagged = chain(zip(small, repeat(1)), zip(large, repeat(2)))
+        with GroupAggregator(operator.itemgetter(0), sides, operator.itemgetter(1),
+                             max_keys=max_keys) as aggregator:
+            aggregator.update(tagged)
+            return [key for key, found_in in aggregator.items() if found_in == 3]
     return list(set(arr1) & set(arr2))
 
 
@@ -109,11 +191,11 @@ def rotate(arr, steps):
     Rotate array by given number of steps
     
     Args:
-        arr: Input list
+        arr: Input list (or RecordFile)
         steps: Number of positions to rotate (positive = right, negative = left)
     
     Returns:
-        Rotated list
+        Rotated list; for a RecordFile, an iterator streaming the rotated records
     
     Example:
         >>> rotate([1, 2, 3, 4, 5], 2)
@@ -121,19 +203,30 @@ def rotate(arr, steps):
         >>> rotate([1, 2, 3, 4, 5], -2)
         [3, 4, 5, 1, 2]
     """
+    if isinstance(arr, RecordFile):
+        split = len(arr) - steps % len(arr) if len(arr) else 0
+        return chain(arr.iter_range(split), arr.iter_range(0, split))
     if not arr:
         return arr
     steps = steps % len(arr)
     return arr[-steps:] + arr[:-steps] if steps else arr
 
 
-def partition(arr, predicate):
+def partition(arr, predicate, workers=None, use_processes=False):
     """
     Partition array into two groups based on predicate
+
+    The predicate is called exactly once per element, in a single pass,
+    so expensive predicates (parsing, validation) are not paid for twice.
     
     Args:
-        arr: Input list
-        predicate: Function that returns True/False for each element
+        arr: Input list (or NumPy array)
+        predicate: Function that returns True/False for each element, or a
+            NumPy boolean mask with one entry per element
+        workers: If set, evaluate the predicate over chunks of the input in a
+            pool of this many workers; output order is preserved
+        use_processes: Use a process pool instead of a thread pool
+            (the predicate must then be picklable, e.g. a module-level function)
     
     Returns:
         Tuple of (elements where predicate is True, elements where predicate is False)
@@ -141,12 +234,100 @@ def partition(arr, predicate):
     Example:
         >>> partition([1, 2, 3, 4, 5, 6], lambda x: x % 2 == 0)
         ([2, 4, 6], [1, 3, 5])
+        >>> values = np.array([1, 2, 3, 4, 5, 6])
+        >>> partition(values, values % 2 == 0)
+        (array([2, 4, 6]), array([1, 3, 5]))
     """
-    true_list = [x for x in arr if predicate(x)]
-    false_list = [x for x in arr if not predicate(x)]
+    if _is_numpy_array(predicate):
+        return _partition_by_mask(arr, predicate)
+
+    if workers:
+        arr = arr if hasattr(arr, '__len__') else list(arr)
+        flags = parallel_apply(predicate, arr, workers=workers, use_processes=use_processes)
+        true_list = list(compress(arr, flags))
+        false_list = [x for x, flag in zip(arr, flags) if not flag]
+        return true_list, false_list
+
+    true_list = []
+    false_list = []
+    for item in arr:
+        if predicate(item):
+            true_list.append(item)
+        else:
+            false_list.append(item)
     return true_list, false_list
 
 
+def partition_by(arr, key_func, n_buckets, workers=None, use_processes=False):
+    """
+    Partition array into N groups based on a bucket-index function
+
+    Generalization of partition: key_func is called exactly once per element
+    and returns the index (0 .. n_buckets - 1) of the bucket it belongs to.
+    
+    Args:
+        arr: Input list (or NumPy array)
+        key_func: Function returning a bucket index for each element, or a
+            NumPy integer array with one bucket index per element
+        n_buckets: Number of buckets
+        workers: If set, evaluate key_func over chunks in a pool of this many workers
+        use_processes: Use a process pool instead of a thread pool
+    
+    Returns:
+        Tuple of n_buckets lists, each keeping the input order
+    
+    Example:
+        >>> partition_by([1, 2, 3, 4, 5, 6, 7], lambda x: x % 3, 3)
+        ([3, 6], [1, 4, 7], [2, 5])
+    """
+    if _is_numpy_array(key_func):
+        return _partition_by_index_array(arr, key_func, n_buckets)
+
+    if workers:
+        arr = arr if hasattr(arr, '__len__') else list(arr)
+        keys = parallel_apply(key_func, arr, workers=workers, use_processes=use_processes)
+        items = zip(keys, arr)
+    else:
+        items = ((key_func(item), item) for item in arr)
+
+    buckets = tuple([] for _ in range(n_buckets))
+    for key, item in items:
+        if not 0 <= key < n_buckets:
+            raise ValueError(f"Bucket index {key} out of range for {n_buckets} buckets")
+        buckets[key].append(item)
+    return buckets
+
+
+def _is_numpy_array(value):
+    """Check whether value is a NumPy array (False when NumPy is missing)."""
+    return NUMPY_AVAILABLE and isinstance(value, np.ndarray)
+
+
+def _partition_by_mask(arr, mask):
+    """Vectorized partition using a precomputed boolean mask."""
+    mask = np.asarray(mask, dtype=bool)
+    if len(mask) != len(arr):
+        raise ValueError("Mask length must match array length")
+    if isinstance(arr, np.ndarray):
+        return arr[mask], arr[~mask]
+    return list(compress(arr, mask)), list(compress(arr, ~mask))
+
+
+def _partition_by_index_array(arr, keys, n_buckets):
+    """Vectorized N-way partition using a precomputed array of bucket indices."""
+    keys = np.asarray(keys)
+    if len(keys) != len(arr):
+        raise ValueError("Key array length must match array length")
+    if len(keys) and (keys.min() < 0 or keys.max() >= n_buckets):
+        raise ValueError(f"Bucket indices must be in range 0..{n_buckets - 1}")
+    # A stable sort keeps the input order inside each bucket
+    order = np.argsort(keys, kind='stable')
+    bounds = np.cumsum(np.bincount(keys, minlength=n_buckets))[:-1]
+    if isinstance(arr, np.ndarray):
+        return tuple(np.split(arr[order], bounds))
+    return tuple([arr[i] for i in part] for part in np.split(order, bounds))
+
+
 def group_by(arr, key_func):
     """
     Group array elements by a key function
@@ -161,6 +342,11 @@ def group_by(arr, key_func):
     Example:
         >>> group_by(['one', 'two', 'three', 'four'], len)
         {3: ['one', 'two'], 5: ['three'], 4: ['four']}
+
+    Note:
+        When only counts, sums or other summaries per key are needed, use
+        aggregate_by instead - it does not keep the elements themselves.
+        For NumPy arrays, group_by_array groups with vectorized ops.
     """
     result = {}
     for item in arr:
@@ -171,6 +357,775 @@ def group_by(arr, key_func):
     return result
 
 
+ArrayGroups = namedtuple('ArrayGroups', ['keys', 'offsets', 'order', 'aggregates'])
+ArrayGroups.__doc__ = """
+Result of group_by_array
+
+    keys: Sorted array of distinct group keys
+    offsets: Array of len(keys) + 1 boundaries; group i is
+        order[offsets[i]:offsets[i + 1]]
+    order: Permutation of the input that makes every group contiguous
+        (stable, so each group keeps input order)
+    aggregates: Dict mapping aggregation name to an array with one value per group
+"""
+
+
+def _is_field_list(arr, key):
+    """True if key is a list of field names of the structured array arr."""
+    return (isinstance(key, list) and arr.dtype.names is not None
+            and all(isinstance(name, str) for name in key))
+
+
+def group_by_array(arr, key=None, values=None, aggregations=('count',)):
+    """
+    Columnar group-by for NumPy arrays and arrays of structs
+
+    Sorts the keys once and finds group boundaries with vectorized
+    comparisons, so no Python object is created per element. Instead of a
+    dict of lists it returns group offsets into a sort permutation plus
+    per-group aggregations computed with ufunc.reduceat.
+    
+    Args:
+        arr: NumPy array (plain or structured)
+        key: None to group by the values themselves, a field name (or list
+            of field names) of a structured array, or a key array of len(arr)
+        values: Values to aggregate - None for arr itself, a field name, or an array
+        aggregations: Names from 'count', 'sum', 'min', 'max', 'mean', 'first', 'last'
+    
+    Returns:
+        ArrayGroups(keys, offsets, order, aggregates)
+    
+    Example:
+        >>> readings = np.array([(1, 2.0), (2, 5.0), (1, 4.0)],
+        ...                     dtype=[('sensor', 'i4'), ('value', 'f8')])
+        >>> groups = group_by_array(readings, 'sensor', 'value', ('count', 'mean'))
+        >>> groups.keys, groups.aggregates['mean']
+        (array([1, 2], dtype=int32), array([3., 5.]))
+        >>> readings[groups.order[groups.offsets[0]:groups.offsets[1]]]  # group 0
+        array([(1, 2.), (1, 4.)], dtype=[('sensor', '<i4'), ('value', '<f8')])
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("group_by_array requires NumPy. Install it with: pip install numpy")
+
+    arr = np.asarray(arr)
+    if key is None:
+        keys = arr
+    elif isinstance(key, str) or _is_field_list(arr, key):
+        keys = arr[key]
+    else:
+        keys = np.asarray(key)
+    if values is None:
+        vals = arr
+    elif isinstance(values, str):
+        vals = arr[values]
+    else:
+        vals = np.asarray(values)
+    if len(keys) != len(vals):
+        raise ValueError("Keys and values must have the same length")
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    # A group starts wherever the sorted key differs from its predecessor
+    starts = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+    starts = np.concatenate(([0], starts)) if len(keys) else starts
+    offsets = np.append(starts, len(keys))
+    counts = np.diff(offsets)
+
+    aggregates = {}
+    if aggregations:
+        sorted_vals = vals[order]
+        for name in aggregations:
+            aggregates[name] = _reduce_groups(name, sorted_vals, starts, offsets, counts)
+    return ArrayGroups(sorted_keys[starts], offsets, order, aggregates)
+
+
+def _reduce_groups(name, sorted_vals, starts, offsets, counts):
+    """Compute one per-group aggregation over values sorted by group."""
+    if name == 'count':
+        return counts
+    if name == 'first':
+        return sorted_vals[starts]
+    if name == 'last':
+        return sorted_vals[offsets[1:] - 1]
+    ufuncs = {'sum': np.add, 'min': np.minimum, 'max': np.maximum, 'mean': np.add}
+    if name not in ufuncs:
+        raise ValueError(f"Unknown aggregation {name!r}")
+    if not len(starts):
+        return sorted_vals[:0]
+    reduced = ufuncs[name].reduceat(sorted_vals, starts)
+    return reduced / counts if name == 'mean' else reduced
+
+
+# ==================== STREAMING AGGREGATION ====================
+
+class Reducer:
+    """
+    Incremental per-key aggregation used by GroupAggregator.
+
+    A reducer folds elements into a small accumulator one at a time, can
+    merge two accumulators (for spilled or parallel partial results) and
+    turns the accumulator into the final value. Accumulators must be
+    picklable so they can be written to disk or returned from worker processes.
+
+    Args:
+        initial: Zero-argument function creating an empty accumulator
+        step: Function (accumulator, value) -> accumulator
+        merge: Function (accumulator, accumulator) -> accumulator
+        finalize: Function accumulator -> result (default identity)
+    """
+
+    def __init__(self, initial, step, merge, finalize=None):
+        self.initial = initial
+        self.step = step
+        self.merge = merge
+        self.finalize = finalize or _identity
+
+
+def _zero():
+    """Return 0, the empty accumulator of counting and bitmask reducers."""
+    return 0
+
+
+def _identity(value):
+    """Return value unchanged."""
+    return value
+
+
+def _min_step(acc, value):
+    """Keep the smaller of the accumulator and value."""
+    return value if acc is None or value < acc else acc
+
+
+def _max_step(acc, value):
+    """Keep the larger of the accumulator and value."""
+    return value if acc is None or value > acc else acc
+
+
+def _merge_optional(func):
+    """Build a merge function for accumulators that start out as None."""
+    def merge(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return func(a, b)
+    return merge
+
+
+def count_reducer():
+    """Reducer counting elements per key."""
+    return Reducer(lambda: 0, lambda acc, _: acc + 1, operator.add)
+
+
+def sum_reducer():
+    """Reducer summing values per key."""
+    return Reducer(lambda: 0, operator.add, operator.add)
+
+
+def min_reducer():
+    """Reducer keeping the smallest value per key."""
+    return Reducer(lambda: None, _min_step, _merge_optional(_min_step))
+
+
+def max_reducer():
+    """Reducer keeping the largest value per key."""
+    return Reducer(lambda: None, _max_step, _merge_optional(_max_step))
+
+
+def mean_reducer():
+    """Reducer computing the arithmetic mean per key from a (total, count) pair."""
+    return Reducer(
+        lambda: (0, 0),
+        lambda acc, value: (acc[0] + value, acc[1] + 1),
+        lambda a, b: (a[0] + b[0], a[1] + b[1]),
+        lambda acc: acc[0] / acc[1] if acc[1] else None,
+    )
+
+
+def first_reducer():
+    """Reducer keeping the first value seen per key."""
+    # () means "nothing seen yet", so None remains a valid value
+    return Reducer(lambda: (), lambda acc, value: acc or (value,),
+                   lambda a, b: a or b, lambda acc: acc[0] if acc else None)
+
+
+def last_reducer():
+    """Reducer keeping the last value seen per key."""
+    return Reducer(lambda: (), lambda acc, value: (value,),
+                   lambda a, b: b or a, lambda acc: acc[0] if acc else None)
+
+
+def top_k_reducer(k, key=None):
+    """
+    Reducer keeping the k largest values per key (O(k) memory per key)
+
+    Args:
+        k: Number of values to keep
+        key: Optional function extracting the comparison key from a value
+
+    Returns:
+        Reducer whose result is a list of up to k values, largest first
+    """
+    # The counter breaks ties so values themselves are never compared
+    tie_breaker = count()
+    score = key or _identity
+
+    def step(heap, value):
+        entry = (score(value), next(tie_breaker), value)
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+        return heap
+
+    def merge(a, b):
+        merged = heapq.nlargest(k, a + b)
+        heapq.heapify(merged)
+        return merged
+
+    def finalize(heap):
+        return [entry[2] for entry in sorted(heap, reverse=True)]
+
+    return Reducer(list, step, merge, finalize)
+
+
+def fold_reducer(func, initial, merge=None):
+    """
+    Reducer built from a custom fold, like functools.reduce per key
+
+    Args:
+        func: Function (accumulator, value) -> accumulator
+        initial: Starting accumulator (should be immutable)
+        merge: Function combining two accumulators; required only when
+            partial results are spilled to disk or merged from workers
+
+    Returns:
+        Reducer
+    """
+    def no_merge(a, b):
+        raise TypeError("fold_reducer needs a merge function to combine partial results")
+
+    return Reducer(lambda: initial, func, merge or no_merge)
+
+
+_NAMED_REDUCERS = {
+    'count': count_reducer,
+    'sum': sum_reducer,
+    'min': min_reducer,
+    'max': max_reducer,
+    'mean': mean_reducer,
+    'first': first_reducer,
+    'last': last_reducer,
+}
+
+
+def _resolve_reducer(reducer):
+    """Turn a reducer name into a Reducer instance."""
+    if isinstance(reducer, Reducer):
+        return reducer
+    try:
+        return _NAMED_REDUCERS[reducer]()
+    except KeyError:
+        raise ValueError(f"Unknown reducer {reducer!r}; choose from {sorted(_NAMED_REDUCERS)}") from None
+
+
+# Re-partitioning rounds before an oversized spill partition is merged anyway
+_MAX_SPILL_DEPTH = 8
+
+
+def _read_spill_records(spill_file):
+    """Yield the pickled (key, accumulator) records of a spill file from its current position."""
+    while True:
+        try:
+            yield pickle.load(spill_file)
+        except EOFError:
+            return
+
+
+class GroupAggregator:
+    """
+    One-pass group-by with incremental per-key reducers
+
+    Keeps one small accumulator per key instead of a list of elements. When
+    the number of in-memory keys exceeds max_keys, accumulators are spilled
+    to hash-partitioned files on disk and merged back partition by partition
+    when results are read. A partition holding more than max_keys distinct
+    keys is split again by a salted hash before merging, so memory stays
+    bounded by the key budget however many keys were spilled.
+
+    Args:
+        key_func: Function to extract grouping key from each element
+        reducer: Reducer name ('count', 'sum', 'min', 'max', 'mean', 'first',
+            'last'), a Reducer instance, or a dict mapping output names to
+            either of those to compute several aggregations at once
+        value_func: Function extracting the value to aggregate (default: element)
+        max_keys: Maximum keys held in memory before spilling (default unbounded)
+        spill_dir: Directory for spill files (default system temp dir)
+        spill_partitions: Number of hash partitions used when spilling
+
+    Example:
+        >>> with GroupAggregator(len, {'n': 'count', 'last': 'last'}) as agg:
+        ...     agg.update(['one', 'two', 'three', 'four'])
+        ...     agg.result()
+        {3: {'n': 2, 'last': 'two'}, 5: {'n': 1, 'last': 'three'}, 4: {'n': 1, 'last': 'four'}}
+
+        Partial results from parallel workers are combined with merge:
+        >>> total.merge(worker_result)  # worker_result from agg.partial()  # doctest: +SKIP
+    """
+
+    def __init__(self, key_func, reducer='count', value_func=None, max_keys=None,
+                 spill_dir=None, spill_partitions=16):
+        if isinstance(reducer, dict):
+            self._names = list(reducer)
+            self._reducers = [_resolve_reducer(r) for r in reducer.values()]
+        else:
+            self._names = None
+            self._reducers = [_resolve_reducer(reducer)]
+        self.key_func = key_func
+        self.value_func = value_func
+        self.max_keys = max_keys
+        self.spill_dir = spill_dir
+        self.spill_partitions = spill_partitions
+        self._accumulators = {}
+        self._spill_path = None
+        self._spill_files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _new_accumulator(self):
+        return [reducer.initial() for reducer in self._reducers]
+
+    def _merge_accumulators(self, a, b):
+        return [reducer.merge(x, y) for reducer, x, y in zip(self._reducers, a, b)]
+
+    def _finalize(self, acc):
+        if self._names is None:
+            return self._reducers[0].finalize(acc[0])
+        return {name: reducer.finalize(value)
+                for name, reducer, value in zip(self._names, self._reducers, acc)}
+
+    def add(self, item):
+        """Fold a single element into its group."""
+        self.update((item,))
+
+    def update(self, iterable):
+        """Consume an iterable of elements in one pass."""
+        accumulators = self._accumulators
+        key_func = self.key_func
+        value_func = self.value_func
+        reducers = list(enumerate(self._reducers))
+        max_keys = self.max_keys
+        for item in iterable:
+            key = key_func(item)
+            value = value_func(item) if value_func else item
+            acc = accumulators.get(key)
+            if acc is None:
+                if max_keys is not None and len(accumulators) >= max_keys:
+                    self.spill()
+                acc = accumulators[key] = self._new_accumulator()
+            for i, reducer in reducers:
+                acc[i] = reducer.step(acc[i], value)
+
+    def merge(self, other):
+        """
+        Merge partial results from another aggregator or from partial()
+
+        Args:
+            other: GroupAggregator or dict mapping keys to raw accumulators
+        """
+        partial_items = other._iter_accumulators() if isinstance(other, GroupAggregator) else other.items()
+        accumulators = self._accumulators
+        for key, acc in partial_items:
+            if key in accumulators:
+                accumulators[key] = self._merge_accumulators(accumulators[key], acc)
+            else:
+                if self.max_keys is not None and len(accumulators) >= self.max_keys:
+                    self.spill()
+                accumulators[key] = acc
+
+    def spill(self):
+        """Write all in-memory accumulators to the spill partitions on disk."""
+        if not self._accumulators:
+            return
+        if self._spill_path is None:
+            self._spill_path = tempfile.mkdtemp(prefix='group_agg_', dir=self.spill_dir)
+            self._spill_files = [
+                open(os.path.join(self._spill_path, f'part-{i}.pkl'), 'w+b')
+                for i in range(self.spill_partitions)
+            ]
+        for key, acc in self._accumulators.items():
+            pickle.dump((key, acc), self._spill_files[hash(key) % self.spill_partitions])
+        self._accumulators.clear()
+
+    def _iter_spill_partition(self, spill_file, depth=0):
+        """
+        Merge and yield all records of one spill partition.
+
+        If the partition turns out to hold more than max_keys distinct keys,
+        it is re-partitioned with a hash salted by depth and each piece is
+        merged on its own.
+        """
+        spill_file.flush()
+        spill_file.seek(0)
+        limit = self.max_keys if depth < _MAX_SPILL_DEPTH else None
+        merged = {}
+        for key, acc in _read_spill_records(spill_file):
+            if key in merged:
+                merged[key] = self._merge_accumulators(merged[key], acc)
+            elif limit is not None and len(merged) >= limit:
+                merged = None
+                break
+            else:
+                merged[key] = acc
+        if merged is not None:
+            spill_file.seek(0, os.SEEK_END)
+            yield from merged.items()
+            return
+
+        n = self.spill_partitions
+        pieces = [tempfile.TemporaryFile(dir=self._spill_path) for _ in range(n)]
+        try:
+            spill_file.seek(0)
+            for key, acc in _read_spill_records(spill_file):
+                pickle.dump((key, acc), pieces[hash((depth, key)) % n])
+            spill_file.seek(0, os.SEEK_END)
+            for piece in pieces:
+                yield from self._iter_spill_partition(piece, depth + 1)
+        finally:
+            for piece in pieces:
+                piece.close()
+
+    def _iter_accumulators(self):
+        """Yield (key, raw accumulator) pairs, merging spilled partitions."""
+        if self._spill_path is None:
+            yield from self._accumulators.items()
+            return
+        self.spill()
+        for spill_file in self._spill_files:
+            yield from self._iter_spill_partition(spill_file)
+
+    def partial(self):
+        """Return raw accumulators as a picklable dict, for merging elsewhere."""
+        return dict(self._iter_accumulators())
+
+    def items(self):
+        """
+        Yield (key, result) pairs
+
+        Keys come in first-seen order unless accumulators were spilled, in
+        which case they are grouped by spill partition.
+        """
+        for key, acc in self._iter_accumulators():
+            yield key, self._finalize(acc)
+
+    def result(self):
+        """Return a dict mapping each key to its aggregated result."""
+        return dict(self.items())
+
+    def close(self):
+        """Remove spill files, if any."""
+        for spill_file in self._spill_files:
+            spill_file.close()
+        if self._spill_path is not None:
+            shutil.rmtree(self._spill_path, ignore_errors=True)
+        self._spill_files = []
+        self._spill_path = None
+
+
+def aggregate_by(iterable, key_func, reducer='count', value_func=None, max_keys=None, spill_dir=None):
+    """
+    Group elements by a key function and aggregate each group in one pass
+
+    Unlike group_by, memory use is one accumulator per key rather than one
+    list entry per element, and the input can be any iterator.
+    
+    Args:
+        iterable: Input elements (any iterable, consumed once)
+        key_func: Function to extract grouping key from each element
+        reducer: Reducer name, Reducer instance, or dict of them (see GroupAggregator)
+        value_func: Function extracting the value to aggregate (default: element)
+        max_keys: Spill to disk when more keys than this are held in memory
+        spill_dir: Directory for spill files (default system temp dir)
+    
+    Returns:
+        Dictionary mapping keys to aggregated results
+    
+    Example:
+        >>> aggregate_by(['one', 'two', 'three', 'four'], len)
+        {3: 2, 5: 1, 4: 1}
+        >>> aggregate_by(['one', 'two', 'three', 'four'], len, 'sum', value_func=lambda w: w.count('o'))
+        {3: 2, 5: 0, 4: 1}
+    """
+    with GroupAggregator(key_func, reducer, value_func, max_keys, spill_dir) as aggregator:
+        aggregator.update(iterable)
+        return aggregator.result()
+
+
+# ==================== OUT-OF-CORE ARRAYS ====================
+
+class RecordFile:
+    """
+    Read-only sequence of fixed-width binary records in a memory-mapped file
+
+    Supports len(), indexing, slicing and iteration, so chunk_array, unique,
+    rotate, partition, intersection and group_by accept it in place of a
+    list. Iteration reads the file in page-aligned windows and releases each
+    window's pages after use, so resident memory stays around one window no
+    matter how large the file is. NumPy users can get the same with
+    numpy.memmap, which is a regular ndarray for the vectorized paths.
+
+    Args:
+        path: Path of the record file
+        fmt: struct format of one record, e.g. '<q' (int64) or '<if' (int32 + float32);
+            single-field records are returned as plain values, others as tuples
+        window_bytes: Approximate bytes decoded per streaming window
+
+    Example:
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     path = os.path.join(tmp, 'ids.bin')
+        ...     RecordFile.write(path, '<q', [5, 3, 5, 1])
+        ...     with RecordFile(path, '<q') as ids:
+        ...         unique(ids), list(rotate(ids, 1))
+        ([5, 3, 1], [1, 5, 3, 5])
+    """
+
+    def __init__(self, path, fmt, window_bytes=1 << 22):
+        self.path = path
+        self._struct = struct.Struct(fmt)
+        self.record_size = self._struct.size
+        self._single = len(self._struct.unpack(bytes(self.record_size))) == 1
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size % self.record_size:
+            self._file.close()
+            raise ValueError(f"File size {size} is not a multiple of the record size {self.record_size}")
+        self._length = size // self.record_size
+        # mmap cannot map an empty file
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        # Windows start on page boundaries and always hold whole records
+        block = math.lcm(mmap.PAGESIZE, self.record_size)
+        self._window = max(1, window_bytes // block) * block
+
+    @classmethod
+    def write(cls, path, fmt, records):
+        """
+        Write an iterable of records to path, streaming in batches
+
+        Args:
+            path: Output file path
+            fmt: struct format of one record
+            records: Iterable of values (single-field formats) or tuples
+        """
+        packer = struct.Struct(fmt)
+        iterator = iter(records)
+        with open(path, 'wb') as out:
+            while True:
+                batch = list(islice(iterator, 4096))
+                if not batch:
+                    break
+                out.write(b''.join(packer.pack(*r) if isinstance(r, tuple) else packer.pack(r)
+                                   for r in batch))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self._length
+
+    def __repr__(self):
+        return f"RecordFile({self.path!r}, {self._struct.format!r}, records={self._length})"
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                return list(self.iter_range(start, stop))
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("RecordFile index out of range")
+        record = self._struct.unpack_from(self._mmap, index * self.record_size)
+        return record[0] if self._single else record
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def iter_range(self, start=0, stop=None):
+        """Stream records start..stop-1 window by window."""
+        stop = self._length if stop is None else min(stop, self._length)
+        position = start * self.record_size
+        end = stop * self.record_size
+        while position < end:
+            window_end = min((position // self._window + 1) * self._window, end)
+            records = self._struct.iter_unpack(self._mmap[position:window_end])
+            if self._single:
+                yield from (record[0] for record in records)
+            else:
+                yield from records
+            self._release(position, window_end)
+            position = window_end
+
+    def iter_chunks(self, size):
+        """Yield lists of up to size records."""
+        iterator = self.iter_range()
+        while True:
+            chunk = list(islice(iterator, size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _release(self, start, end):
+        """Tell the OS the pages of a finished window may be dropped."""
+        if hasattr(mmap, 'MADV_DONTNEED') and not self._mmap.closed:
+            page_start = start - start % mmap.PAGESIZE
+            self._mmap.madvise(mmap.MADV_DONTNEED, page_start, end - page_start)
+
+    def close(self):
+        """Unmap and close the underlying file."""
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+
+# ==================== PARALLEL MAP ====================
+
+# Chunk sizing: aim for chunks that take roughly this long to process, so
+# pool overhead (task hand-off, pickling for processes) stays small
+_THREAD_CHUNK_SECONDS = 0.01
+_PROCESS_CHUNK_SECONDS = 0.1
+_MAX_CHUNK_SIZE = 4096
+
+
+class ParallelMapError(Exception):
+    """
+    Raised by parallel_map when func fails for an element
+
+    Attributes:
+        index: Position of the failing element in the input
+        item: The failing element
+        error: The original exception
+    """
+
+    def __init__(self, index, item, error):
+        super().__init__(index, item, error)
+        self.index = index
+        self.item = item
+        self.error = error
+
+    def __str__(self):
+        return f"Item {self.index} ({self.item!r}) failed: {self.error!r}"
+
+
+def _map_chunk(func, start, chunk):
+    """Apply func to one chunk in a pool worker; returns (start, results, seconds)."""
+    began = time.perf_counter()
+    results = []
+    for offset, item in enumerate(chunk):
+        try:
+            results.append(func(item))
+        except Exception as error:
+            raise ParallelMapError(start + offset, item, error) from error
+    return start, results, time.perf_counter() - began
+
+
+def parallel_map(func, iterable, workers=None, use_processes=False, chunk_size=None,
+                 ordered=True, max_in_flight=None):
+    """
+    Apply func to every element using a thread or process pool, streaming results
+
+    Elements are batched into chunks (as chunk_array does) so each pool task
+    amortizes its overhead. Unless chunk_size is given, chunk sizes adapt to
+    the measured per-element cost. The input is read lazily and at most
+    max_in_flight chunks are pending at any time, so memory stays bounded
+    even for very long or infinite iterators.
+    
+    Args:
+        func: Function applied to each element (picklable if use_processes)
+        iterable: Input elements (any iterable, read lazily)
+        workers: Pool size (default os.cpu_count())
+        use_processes: Use a process pool instead of a thread pool
+        chunk_size: Fixed chunk size (default adaptive)
+        ordered: Yield results in input order; if False, yield each chunk's
+            results as soon as it completes
+        max_in_flight: Maximum pending chunks (default 2 * workers)
+    
+    Yields:
+        func(element) for each element
+    
+    Raises:
+        ParallelMapError: If func raises; carries the element's index and value
+    
+    Example:
+        >>> list(parallel_map(lambda x: x * x, range(6), workers=2))
+        [0, 1, 4, 9, 16, 25]
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    target_seconds = _PROCESS_CHUNK_SECONDS if use_processes else _THREAD_CHUNK_SECONDS
+    iterator = iter(iterable)
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    executor = executor_class(max_workers=workers)
+    pending = deque() if ordered else set()
+    next_index = 0
+    # Start with single-element chunks until a per-element cost is measured
+    size = chunk_size or 1
+    item_cost = None
+
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                chunk = list(islice(iterator, size))
+                if not chunk:
+                    exhausted = True
+                    break
+                future = executor.submit(_map_chunk, func, next_index, chunk)
+                if ordered:
+                    pending.append(future)
+                else:
+                    pending.add(future)
+                next_index += len(chunk)
+            if not pending:
+                return
+
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending -= done
+            for future in done:
+                _, results, seconds = future.result()
+                if not chunk_size and results:
+                    cost = seconds / len(results)
+                    item_cost = cost if item_cost is None else 0.7 * item_cost + 0.3 * cost
+                    size = (_MAX_CHUNK_SIZE if item_cost <= 0
+                            else max(1, min(_MAX_CHUNK_SIZE, int(target_seconds / item_cost))))
+                yield from results
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def parallel_apply(func, arr, **kwargs):
+    """
+    Apply func to every element in parallel and return the results as a list
+
+    Eager counterpart of parallel_map; accepts the same keyword arguments.
+    
+    Example:
+        >>> parallel_apply(len, ['one', 'three', 'four'], workers=2)
+        [3, 5, 4]
+    """
+    return list(parallel_map(func, arr, **kwargs))
+
+
 if __name__ == "__main__":
     # Example usage
     print("=== Array Utils Examples ===")
@@ -181,4 +1136,6 @@ if __name__ == "__main__":
     print(f"Difference: {difference([1, 2, 3, 4], [3, 4, 5, 6])}")
     print(f"Rotate right: {rotate([1, 2, 3, 4, 5], 2)}")
     print(f"Partition: {partition([1, 2, 3, 4, 5, 6], lambda x: x % 2 == 0)}")
+    print(f"Partition by mod 3: {partition_by([1, 2, 3, 4, 5, 6, 7], lambda x: x % 3, 3)}")
     print(f"Group by length: {group_by(['one', 'two', 'three', 'four'], len)}")
+    print(f"Count by length: {aggregate_by(['one', 'two', 'three', 'four'], len)}")
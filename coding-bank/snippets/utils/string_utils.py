@@ -4,7 +4,49 @@ String Utility Functions
 Common string manipulation and validation utilities.
 """
 
+import codecs
+import json
 import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+
+# Size of the LRU caches in front of the case converters. Jobs convert
+# millions of names but only a few thousand distinct ones.
+CASE_CACHE_SIZE = 4096
+
+# Precompiled patterns for camel_to_snake: first split an acronym from the
+# word after it ("HTTPServer" -> "HTTP_Server"), then split any other letter
+# or digit, including non-ASCII ones, from a following capital
+# ("helloWorld" -> "hello_World", "caféOlé" -> "café_Olé")
+_ACRONYM_BOUNDARY = re.compile(r'([A-Z]+)([A-Z][a-z])')
+_WORD_BOUNDARY = re.compile(r'([^\W_A-Z])([A-Z])')
+
+# Vowel counting deletes vowels with a translate table (a C-level pass)
+# and compares lengths, instead of testing characters one by one
+_VOWELS = "aeiouAEIOU"
+_VOWEL_DELETE_TABLE = str.maketrans('', '', _VOWELS)
+_VOWEL_BYTES = _VOWELS.encode('ascii')
+
+# Long inputs are deduplicated chunk by chunk: characters already seen are
+# deleted from each chunk with one translate() pass, and whatever is left is
+# deduplicated with one find() per candidate character (a C-speed scan of a
+# cache-sized chunk) instead of iterating per character
+_ASCII_CHARS = [chr(i) for i in range(128)]
+_BYTE_VALUES = [bytes([i]) for i in range(256)]
+_FIND_SCAN_MIN_LENGTH = 1024
+
+# Chunk size for buffers and files processed in streaming mode
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Anagram signatures: short words sort their characters (C-speed, cheapest
+# below this length); longer ones count characters in linear time, with one
+# C-level count() per letter for plain ASCII words
+_COUNT_SIGNATURE_MIN_LENGTH = 64
+_ASCII_LETTERS = "abcdefghijklmnopqrstuvwxyz"
 
 
 def capitalize_words(text):
@@ -29,7 +71,8 @@ def count_vowels(text):
     Count the number of vowels in a string
     
     Args:
-        text: Input string
+        text: Input string, or a bytes-like object (bytes, bytearray,
+            memoryview, mmap) counted chunk by chunk
     
     Returns:
         Number of vowels (a, e, i, o, u)
@@ -37,9 +80,13 @@ def count_vowels(text):
     Example:
         >>> count_vowels("Hello World")
         3
+        >>> count_vowels(b"Hello World")
+        3
     """
-    vowels = "aeiouAEIOU"
-    return sum(1 for char in text if char in vowels)
+    if isinstance(text, str):
+        return len(text) - len(text.translate(_VOWEL_DELETE_TABLE))
+    return sum(len(chunk) - len(chunk.translate(None, _VOWEL_BYTES))
+               for chunk in _iter_buffer_chunks(text))
 
 
 def remove_duplicates(text):
@@ -47,22 +94,125 @@ def remove_duplicates(text):
     Remove duplicate characters while preserving order
     
     Args:
-        text: Input string
+        text: Input string, or a bytes-like object (bytes, bytearray,
+            memoryview, mmap) processed chunk by chunk
     
     Returns:
-        String with duplicates removed
+        String with duplicates removed (bytes for bytes-like input)
     
     Example:
         >>> remove_duplicates("hello")
         "helo"
+        >>> remove_duplicates(b"hello")
+        b"helo"
+    """
+    if isinstance(text, str):
+        if len(text) < _FIND_SCAN_MIN_LENGTH:
+            return ''.join(dict.fromkeys(text))
+        return _merge_unique(_iter_buffer_chunks(text), '')
+    if isinstance(text, (bytes, bytearray)) and len(text) < _FIND_SCAN_MIN_LENGTH:
+        return bytes(dict.fromkeys(text))
+    return _merge_unique(_iter_buffer_chunks(text), b'')
+
+
+def count_vowels_file(source, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Count vowels in a file without loading it into memory
+    
+    Args:
+        source: File path, or an open binary or text file object
+        chunk_size: Bytes (or characters) read per chunk
+    
+    Returns:
+        Number of vowels; UTF-8 and other ASCII-compatible files can be
+        counted in binary mode since vowels are single bytes
+    
+    Example:
+        >>> count_vowels_file("corpus.txt")
+        1843200
+    """
+    return sum(count_vowels(chunk) for chunk in _iter_file_chunks(source, chunk_size))
+
+
+def remove_duplicates_file(source, encoding=None, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Remove duplicate characters from a file's contents, streaming
+    
+    Args:
+        source: File path, or an open binary or text file object
+        encoding: Decode a binary source with this encoding; without it,
+            paths are read as bytes and bytes are returned
+        chunk_size: Bytes (or characters) read per chunk
+    
+    Returns:
+        Distinct characters (or bytes) in order of first occurrence
+    
+    Example:
+        >>> remove_duplicates_file("corpus.txt", encoding="utf-8")
+        "The quickbrownfxjmpsvtlazydg."
+    """
+    chunks = _iter_file_chunks(source, chunk_size)
+    empty = source.read(0) if hasattr(source, 'read') else b''
+    if encoding is not None:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        chunks = (decoder.decode(chunk) for chunk in chunks)
+        empty = ''
+    return _merge_unique(chunks, empty)
+
+
+def _first_occurrences(text, candidates):
+    """Return the candidates found in text, ordered by first occurrence."""
+    positions = sorted((text.find(candidate), candidate) for candidate in candidates)
+    return [candidate for position, candidate in positions if position >= 0]
+
+
+def _unique_in_chunk(chunk, seen):
+    """
+    Characters (byte values for bytes) of chunk not in seen, in order of first occurrence.
+
+    Seen characters are deleted first, so only characters that are actually
+    new are searched for, and a chunk adding nothing costs one translate().
     """
-    seen = set()
-    result = []
-    for char in text:
-        if char not in seen:
-            seen.add(char)
-            result.append(char)
-    return ''.join(result)
+    if isinstance(chunk, str):
+        if seen:
+            chunk = chunk.translate(dict.fromkeys(map(ord, seen)))
+        if len(chunk) < _FIND_SCAN_MIN_LENGTH or not chunk.isascii():
+            return dict.fromkeys(chunk)
+        candidates = [c for c in _ASCII_CHARS if c not in seen]
+        return dict.fromkeys(_first_occurrences(chunk, candidates))
+    if seen:
+        chunk = chunk.translate(None, bytes(seen))
+    if len(chunk) < _FIND_SCAN_MIN_LENGTH:
+        return dict.fromkeys(chunk)
+    candidates = [value for value in _BYTE_VALUES if value[0] not in seen]
+    return dict.fromkeys(value[0] for value in _first_occurrences(chunk, candidates))
+
+
+def _merge_unique(chunks, empty):
+    """Deduplicate a stream of str or bytes chunks, keeping first occurrences."""
+    seen = {}
+    for chunk in chunks:
+        seen.update(_unique_in_chunk(chunk, seen))
+        # Every byte value has been seen; the rest of the input cannot add any
+        if not isinstance(chunk, str) and len(seen) == 256:
+            break
+    return ''.join(seen) if isinstance(empty, str) else bytes(seen)
+
+
+def _iter_buffer_chunks(data, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield bytes chunks of a bytes-like object (bytes, memoryview, mmap...)."""
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        yield chunk.tobytes() if isinstance(chunk, memoryview) else chunk
+
+
+def _iter_file_chunks(source, chunk_size):
+    """Yield chunks read from a file path or an open file object."""
+    if hasattr(source, 'read'):
+        yield from iter(lambda: source.read(chunk_size), source.read(0))
+        return
+    with open(source, 'rb') as file:
+        yield from iter(lambda: file.read(chunk_size), b'')
 
 
 def is_anagram(str1, str2):
@@ -82,7 +232,139 @@ def is_anagram(str1, str2):
         >>> is_anagram("hello", "world")
         False
     """
-    return sorted(str1.lower()) == sorted(str2.lower())
+    str1, str2 = str1.lower(), str2.lower()
+    if len(str1) != len(str2):
+        return False
+    if len(str1) < _COUNT_SIGNATURE_MIN_LENGTH:
+        return sorted(str1) == sorted(str2)
+    if str1.isascii() and str1.isalpha():
+        # Stops at the first letter whose count differs
+        return all(str1.count(letter) == str2.count(letter) for letter in _ASCII_LETTERS)
+    return Counter(str1) == Counter(str2)
+
+
+def anagram_signature(text):
+    """
+    Compute a key shared by exactly the (case-insensitive) anagrams of text
+    
+    Args:
+        text: Input string
+    
+    Returns:
+        The sorted lowercase characters (str) for short text; for text of
+        _COUNT_SIGNATURE_MIN_LENGTH characters or more, the character counts,
+        computed in linear time: a tuple of 26 letter counts for plain ASCII
+        words, a frozenset of (character, count) pairs otherwise
+    
+    Example:
+        >>> anagram_signature("listen") == anagram_signature("Silent")
+        True
+    """
+    text = text.lower()
+    if len(text) < _COUNT_SIGNATURE_MIN_LENGTH:
+        return ''.join(sorted(text))
+    if text.isascii() and text.isalpha():
+        return tuple(map(text.count, _ASCII_LETTERS))
+    return frozenset(Counter(text).items())
+
+
+class AnagramIndex:
+    """
+    Index of words grouped by anagram signature
+    
+    Building the index computes one signature per word in a single pass;
+    afterwards looking up all anagrams of a word is a dict lookup instead
+    of an is_anagram call per candidate.
+    
+    Args:
+        words: Optional iterable of words to index
+    
+    Example:
+        >>> index = AnagramIndex(["listen", "silent", "enlist", "google"])
+        >>> index.anagrams("tinsel")
+        ["listen", "silent", "enlist"]
+        >>> import os, tempfile
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     index.save(os.path.join(tmp, "anagrams.json"))
+        ...     AnagramIndex.load(os.path.join(tmp, "anagrams.json")).groups()
+        [["listen", "silent", "enlist"]]
+    """
+
+    def __init__(self, words=()):
+        self._groups = {}
+        self._size = 0
+        self.add_all(words)
+
+    def __len__(self):
+        """Number of indexed words."""
+        return self._size
+
+    def __contains__(self, word):
+        return word in self._groups.get(anagram_signature(word), ())
+
+    def add(self, word):
+        """Add a single word to the index."""
+        self.add_all((word,))
+
+    def add_all(self, words):
+        """Add many words in one pass (duplicates are ignored)."""
+        groups = self._groups
+        signature = anagram_signature
+        for word in words:
+            group = groups.setdefault(signature(word), [])
+            if word not in group:
+                group.append(word)
+                self._size += 1
+
+    def anagrams(self, word, include_self=False):
+        """
+        Return the indexed anagrams of word
+
+        Args:
+            word: Word to look up (need not be in the index)
+            include_self: Keep word itself in the result if it is indexed
+        """
+        group = self._groups.get(anagram_signature(word), [])
+        if include_self:
+            return list(group)
+        return [other for other in group if other != word]
+
+    def groups(self, min_size=2):
+        """Return all groups with at least min_size words, in insertion order."""
+        return [list(group) for group in self._groups.values() if len(group) >= min_size]
+
+    def save(self, path):
+        """Write the index to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({"groups": list(self._groups.values())}, file, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by save, computing one signature per group."""
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+        index = cls()
+        for group in data["groups"]:
+            index._groups[anagram_signature(group[0])] = group
+            index._size += len(group)
+        return index
+
+
+def group_anagrams(words):
+    """
+    Group a word list into anagram groups in one pass
+    
+    Args:
+        words: Iterable of words
+    
+    Returns:
+        List of groups (lists of words) with more than one member
+    
+    Example:
+        >>> group_anagrams(["listen", "google", "silent", "act", "cat"])
+        [["listen", "silent"], ["act", "cat"]]
+    """
+    return AnagramIndex(words).groups()
 
 
 def truncate(text, max_length, suffix="..."):
@@ -106,10 +388,13 @@ def truncate(text, max_length, suffix="..."):
     return text[:max_length - len(suffix)] + suffix
 
 
+@lru_cache(maxsize=CASE_CACHE_SIZE)
 def snake_to_camel(text):
     """
     Convert snake_case to camelCase
     
+    Results are cached (see case_conversion_stats).
+    
     Args:
         text: Snake case string
     
@@ -124,10 +409,14 @@ def snake_to_camel(text):
     return components[0] + ''.join(x.title() for x in components[1:])
 
 
+@lru_cache(maxsize=CASE_CACHE_SIZE)
 def camel_to_snake(text):
     """
     Convert camelCase to snake_case
     
+    Runs of capitals are treated as acronyms. Results are cached (see
+    case_conversion_stats).
+    
     Args:
         text: Camel case string
     
@@ -137,8 +426,256 @@ def camel_to_snake(text):
     Example:
         >>> camel_to_snake("helloWorldExample")
         "hello_world_example"
+        >>> camel_to_snake("HTTPServerError")
+        "http_server_error"
+    """
+    return _WORD_BOUNDARY.sub(r'\1_\2', _ACRONYM_BOUNDARY.sub(r'\1_\2', text)).lower()
+
+
+def convert_names(names, converter):
+    """
+    Convert a list of identifiers in one pass
+    
+    Args:
+        names: Iterable of identifier strings
+        converter: Conversion function, e.g. camel_to_snake
+    
+    Returns:
+        List of converted names
+    
+    Example:
+        >>> convert_names(["userId", "HTTPStatus"], camel_to_snake)
+        ["user_id", "http_status"]
+    """
+    return list(map(converter, names))
+
+
+def convert_keys(data, converter):
+    """
+    Convert the string keys of a dict, recursing into nested dicts and lists
+    
+    Args:
+        data: JSON-like structure (dicts, lists and scalars)
+        converter: Conversion function, e.g. snake_to_camel
+    
+    Returns:
+        New structure with converted keys; values are left unchanged
+    
+    Example:
+        >>> convert_keys({"userId": 1, "tags": [{"tagName": "x"}]}, camel_to_snake)
+        {"user_id": 1, "tags": [{"tag_name": "x"}]}
+    """
+    if isinstance(data, dict):
+        return {converter(key) if isinstance(key, str) else key: convert_keys(value, converter)
+                for key, value in data.items()}
+    if isinstance(data, list):
+        return [convert_keys(item, converter) for item in data]
+    return data
+
+
+def case_conversion_stats():
     """
-    return re.sub(r'(?<!^)(?=[A-Z])', '_', text).lower()
+    Report cache statistics for the case converters
+    
+    Returns:
+        Dict mapping converter name to hits, misses, cached entry count
+        and hit rate
+    
+    Example:
+        >>> case_conversion_stats()["camel_to_snake"]
+        {"hits": 998, "misses": 2, "size": 2, "hit_rate": 0.998}
+    """
+    stats = {}
+    for converter in (snake_to_camel, camel_to_snake):
+        info = converter.cache_info()
+        lookups = info.hits + info.misses
+        stats[converter.__name__] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+        }
+    return stats
+
+
+# ==================== TEXT PIPELINES ====================
+
+def _bind_stage(func, args, kwargs):
+    """Turn a (func, args, kwargs) stage into a one-argument callable."""
+    if not args and not kwargs:
+        return func
+    return lambda text: func(text, *args, **kwargs)
+
+
+def _transform_lines(stages, lines, stage_seconds=None):
+    """Run every line through all stages, optionally timing each stage."""
+    calls = [_bind_stage(*stage) for stage in stages]
+    if stage_seconds is None:
+        for line in lines:
+            for call in calls:
+                line = call(line)
+            yield line
+        return
+    clock = time.perf_counter
+    for line in lines:
+        for i, call in enumerate(calls):
+            started = clock()
+            line = call(line)
+            stage_seconds[i] += clock() - started
+        yield line
+
+
+def _transform_batch(stages, lines, collect_stats):
+    """Transform one batch of lines in a worker process."""
+    stage_seconds = [0.0] * len(stages) if collect_stats else None
+    return list(_transform_lines(stages, lines, stage_seconds)), stage_seconds
+
+
+class TextPipeline:
+    """
+    Composable chain of string transforms run as one pass over a line stream
+    
+    Each line goes through every stage before the next line is read, so a
+    stream of any size is processed with bounded memory and no intermediate
+    list per stage. Stages are any functions taking the text as their first
+    argument, such as the functions in this module.
+    
+    Args:
+        collect_stats: Time every stage call (adds a little overhead per call)
+    
+    Example:
+        >>> pipeline = TextPipeline().then(camel_to_snake).then(truncate, 12)
+        >>> list(pipeline.run(["helloWorldExample", "fooBar"]))
+        ["hello_wor...", "foo_bar"]
+        >>> pipeline.run_file("fields.txt", "-")  # write to stdout
+    """
+
+    def __init__(self, collect_stats=False):
+        self.collect_stats = collect_stats
+        self._stages = []
+        self.reset_stats()
+
+    def then(self, func, *args, **kwargs):
+        """
+        Return a new pipeline with func(text, *args, **kwargs) appended
+
+        For process fan-out, func must be picklable (a module-level function).
+        """
+        pipeline = TextPipeline(self.collect_stats)
+        pipeline._stages = self._stages + [(func, args, kwargs)]
+        pipeline.reset_stats()
+        return pipeline
+
+    def __call__(self, text):
+        """Apply the pipeline to a single string."""
+        return next(_transform_lines(self._stages, (text,)))
+
+    def reset_stats(self):
+        """Clear the throughput counters."""
+        self._records = 0
+        self._stage_seconds = [0.0] * len(self._stages)
+
+    def stats(self):
+        """
+        Return throughput counters accumulated over all runs
+
+        Returns:
+            Dict with the number of records and, per stage (in order), the
+            seconds spent and records per second; timings need collect_stats
+            and are summed over worker processes when fanned out
+        """
+        stages = []
+        for (func, _, _), seconds in zip(self._stages, self._stage_seconds):
+            stages.append({
+                "name": getattr(func, '__name__', repr(func)),
+                "seconds": seconds,
+                "records_per_second": self._records / seconds if seconds else None,
+            })
+        return {"records": self._records, "stages": stages}
+
+    def run(self, lines, workers=None, batch_size=1000, max_in_flight=None):
+        """
+        Lazily transform a stream of lines
+        
+        Args:
+            lines: Iterable of strings; trailing newlines are stripped
+            workers: Fan batches out to this many processes (default: in-process)
+            batch_size: Lines per batch sent to a worker process
+            max_in_flight: Maximum batches pending in workers (default 2 * workers)
+        
+        Yields:
+            Transformed lines, in input order
+        """
+        lines = (line.rstrip('\r\n') for line in lines)
+        if not workers:
+            stage_seconds = self._stage_seconds if self.collect_stats else None
+            for line in _transform_lines(self._stages, lines, stage_seconds):
+                self._records += 1
+                yield line
+            return
+
+        max_in_flight = max_in_flight or 2 * workers
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            try:
+                while True:
+                    while len(pending) < max_in_flight:
+                        batch = list(islice(lines, batch_size))
+                        if not batch:
+                            break
+                        pending.append(executor.submit(
+                            _transform_batch, self._stages, batch, self.collect_stats))
+                    if not pending:
+                        return
+                    results, stage_seconds = pending.popleft().result()
+                    self._records += len(results)
+                    if stage_seconds:
+                        self._stage_seconds = [a + b for a, b in zip(self._stage_seconds, stage_seconds)]
+                    yield from results
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def run_file(self, source='-', dest='-', encoding='utf-8', **kwargs):
+        """
+        Transform a file (or stdin) line by line into another file (or stdout)
+        
+        Args:
+            source: Input path, open text file, or '-' for stdin
+            dest: Output path, open text file, or '-' for stdout
+            encoding: Encoding used when opening paths
+            **kwargs: Passed to run (workers, batch_size, max_in_flight)
+        
+        Returns:
+            Number of lines written
+        """
+        written = 0
+        with _open_text(source, 'r', encoding) as infile, _open_text(dest, 'w', encoding) as outfile:
+            for line in self.run(infile, **kwargs):
+                outfile.write(line)
+                outfile.write('\n')
+                written += 1
+        return written
+
+
+class _open_text:
+    """Open a path for text I/O, or pass through '-' (stdio) and file objects unclosed."""
+
+    def __init__(self, target, mode, encoding):
+        self._owned = not hasattr(target, 'read' if mode == 'r' else 'write') and target != '-'
+        if self._owned:
+            self.file = open(target, mode, encoding=encoding)
+        elif target == '-':
+            self.file = sys.stdin if mode == 'r' else sys.stdout
+        else:
+            self.file = target
+
+    def __enter__(self):
+        return self.file
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._owned:
+            self.file.close()
 
 
 if __name__ == "__main__":
@@ -148,6 +685,10 @@ if __name__ == "__main__":
     print(f"Count vowels in 'Hello World': {count_vowels('Hello World')}")
     print(f"Remove duplicates from 'hello': {remove_duplicates('hello')}")
     print(f"Is 'listen' an anagram of 'silent'? {is_anagram('listen', 'silent')}")
+    print(f"Anagram groups: {group_anagrams(['listen', 'google', 'silent', 'act', 'cat'])}")
     print(f"Truncate: {truncate('This is a long sentence', 10)}")
     print(f"Snake to Camel: {snake_to_camel('hello_world_example')}")
     print(f"Camel to Snake: {camel_to_snake('helloWorldExample')}")
+    print(f"Acronyms: {camel_to_snake('HTTPServerError')}")
+    print(f"Pipeline: {list(TextPipeline().then(camel_to_snake).then(truncate, 12).run(['helloWorldExample', 'fooBar']))}")
+    print(f"Convert keys: {convert_keys({'userId': 1, 'tags': [{'tagName': 'x'}]}, camel_to_snake)}")